@@ -188,13 +188,13 @@ class AWSDataStore:
             with self.get_db_connection() as conn:
                 with conn.cursor() as cursor:
                     # Check if user exists
-                    cursor.execute("SELECT id FROM users WHERE email = %s", (email,))
+                    cursor.execute("SELECT id, github_token, github_username FROM users WHERE email = %s", (email,))
                     result = cursor.fetchone()
                     
                     if result:
                         user_id = result[0]
-                        # Update GitHub token if provided
-                        if github_token:
+                        # Update GitHub token if provided and it differs from the stored one
+                        if github_token and (result[1], result[2]) != (github_token, github_username):
                             cursor.execute(
                                 "UPDATE users SET github_token = %s, github_username = %s, updated_at = NOW() WHERE id = %s",
                                 (github_token, github_username, user_id)
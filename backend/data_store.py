@@ -1,26 +1,107 @@
 import os
 import time
-from supabase import create_client, Client
+import asyncio
+import functools
+import threading
+import httpx
+from supabase import create_client, Client, ClientOptions, acreate_client, AsyncClient, AsyncClientOptions
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from types import MappingProxyType, SimpleNamespace
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Union
 from config import SUPABASE_URL, SUPABASE_KEY
 import logging
 
 logger = logging.getLogger(__name__)
 
+SUPABASE_HTTP_TIMEOUT = 10
+
+# Shared empty result returned by TestDataStore getters; callers only read it
+_EMPTY_LIST: List[Dict[str, Any]] = []
+
+# Shared read-only rows for TestDataStore fixtures that need non-empty results
+_FAKE_REPO: Mapping[str, Any] = MappingProxyType({
+    'id': 'test-user-repo-id',
+    'created_at': '2024-01-01T00:00:00+00:00',
+    'repos': MappingProxyType({
+        'id': 'test-repo-id',
+        'owner': 'test-user',
+        'name': 'test-repo',
+        'full_name': 'test-user/test-repo'
+    })
+})
+_FAKE_METRIC: Mapping[str, Any] = MappingProxyType({
+    'id': 'test-metric-id',
+    'timestamp': '2024-01-01T00:00:00+00:00',
+    'metrics_data': MappingProxyType({})
+})
+
+
+def _create_http_client() -> httpx.Client:
+    """Create the long-lived HTTP/2 client shared by all Supabase sub-clients."""
+    return httpx.Client(
+        http2=True,
+        timeout=SUPABASE_HTTP_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+    )
+
+
+def _create_supabase_client(http_client: httpx.Client) -> Client:
+    """Create a Supabase client that multiplexes its requests over http_client."""
+    options = ClientOptions(httpx_client=http_client, postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop thread used to run async reads for sync callers."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, name="datastore-async", daemon=True).start()
+        return _background_loop
+
+
+def _transform_user_repos(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert flat get_user_repos_data rows to the nested shape used by the dashboard."""
+    return [
+        {
+            'id': repo_data.get('user_repo_id'),  # user_repos table id for deletion
+            'created_at': repo_data.get('repo_created_at', ''),
+            'repos': {
+                'id': repo_data.get('repo_id'),
+                'owner': repo_data.get('owner'),
+                'name': repo_data.get('name'),
+                'full_name': repo_data.get('full_name')
+            }
+        }
+        for repo_data in rows
+    ]
+
+
 class DataStore:
     def __init__(self):
         """Initialize Supabase connection with proper credentials."""
         self.client: Optional[Client] = None
         self.supabase: Optional[Client] = None
         self._session = None
+        self._async_client: Optional[AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_lock: Optional[asyncio.Lock] = None
+        # (access_token, refresh_token) last applied to the async client
+        self._async_session_tokens: Optional[Tuple[str, str]] = None
         
         # Store URL and key for access by frontend
         self.supabase_url = SUPABASE_URL
         self.supabase_key = SUPABASE_KEY
         
         try:
-            self.client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            # One persistent HTTP/2 connection pool is reused for every request
+            self._http_client = _create_http_client()
+            self.client = _create_supabase_client(self._http_client)
             self.supabase = self.client  # Keep reference for backward compatibility
             logger.info("Supabase client initialized")
         except Exception as e:
@@ -139,9 +220,9 @@ class DataStore:
             
             # Step 4: Create a new client instance to ensure clean state
             try:
-                # Re-initialize the client to ensure no cached auth state
-                from config import SUPABASE_URL, SUPABASE_KEY
-                self.client = create_client(SUPABASE_URL, SUPABASE_KEY)
+                # Re-initialize the client to ensure no cached auth state,
+                # keeping the existing HTTP connection pool
+                self.client = _create_supabase_client(self._http_client)
                 logger.info("Supabase client re-initialized after sign out")
             except Exception as e:
                 logger.warning(f"Could not re-initialize Supabase client: {e}")
@@ -182,8 +263,8 @@ class DataStore:
             # Try to get existing user first
             user = self.get_user_by_email(email)
             if user:
-                # Update GitHub token if provided
-                if github_token:
+                # Update GitHub token if provided and it differs from the stored one
+                if github_token and self._github_credentials_changed(user, github_token, github_username):
                     self.update_user_github_token(email, github_token, github_username)
                 return user['id']
             
@@ -212,6 +293,14 @@ class DataStore:
             logger.error(f"Error ensuring user exists: {e}")
             return None
     
+    @staticmethod
+    def _github_credentials_changed(user: Dict[str, Any], github_token: str, github_username: str = None) -> bool:
+        """Check whether the stored GitHub token/username differ from the given ones"""
+        if user.get('github_token') != github_token:
+            return True
+        # update_user_github_token leaves the username untouched when none is given
+        return bool(github_username) and user.get('github_username') != github_username
+
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email address using stored procedure to bypass RLS"""
         try:
@@ -250,21 +339,7 @@ class DataStore:
                 logger.info(f"Retrieved {len(response.data)} repos for user {user_email}")
                 
                 # Transform flat structure to nested structure expected by dashboard
-                transformed_repos = []
-                for repo_data in response.data:
-                    transformed_repo = {
-                        'id': repo_data.get('user_repo_id'),  # user_repos table id for deletion
-                        'created_at': repo_data.get('repo_created_at', ''),
-                        'repos': {
-                            'id': repo_data.get('repo_id'),
-                            'owner': repo_data.get('owner'),
-                            'name': repo_data.get('name'),
-                            'full_name': repo_data.get('full_name')
-                        }
-                    }
-                    transformed_repos.append(transformed_repo)
-                
-                return transformed_repos
+                return _transform_user_repos(response.data)
             else:
                 logger.info(f"No repos found for user {user_email}")
                 return []
@@ -312,8 +387,8 @@ class DataStore:
             
             success = response is not None
             if success:
-                logger.info(f"Delete operation completed for user {user_id}, repo {repo_id}")
-                logger.info(f"Response data: {response.data}")
+                logger.info("Delete operation completed for user %s, repo %s", user_id, repo_id)
+                logger.debug("Response data: %r", response.data)
                 
                 # Clean up unused repository if requested
                 if cleanup_unused_repo:
@@ -396,7 +471,7 @@ class DataStore:
             ).execute()
             
             # Log the full response for debugging
-            logger.info(f"Save user repo response: {response}")
+            logger.debug("Save user repo response: %r", response)
             
             # Check if the response indicates success
             # The stored procedure might return different formats
@@ -417,9 +492,9 @@ class DataStore:
                     success = bool(response.data)
             
             if success:
-                logger.info(f"User repo association saved: {user_email} -> {repo_full_name}")
+                logger.info("User repo association saved: %s -> %s", user_email, repo_full_name)
             else:
-                logger.error(f"Save user repo failed - response: {response.data if hasattr(response, 'data') else 'No data'}")
+                logger.error("Save user repo failed - response: %r", getattr(response, 'data', 'No data'))
             
             return success
         except Exception as e:
@@ -515,7 +590,7 @@ class DataStore:
                     if isinstance(first_item, dict):
                         success = first_item.get('status') == 'success'
                         if success:
-                            logger.info(f"Repository metrics saved for {repo_owner}/{repo_name} via stored procedure")
+                            logger.debug("Repository metrics saved for %s/%s via stored procedure", repo_owner, repo_name)
                         else:
                             logger.error(f"Stored procedure failed with status: {first_item.get('status')}")
                     else:
@@ -526,7 +601,8 @@ class DataStore:
                     success = bool(response.data)
             
             if not success:
-                logger.error(f"Failed to save repository metrics for {repo_owner}/{repo_name} - response: {response.data if hasattr(response, 'data') else 'No data'}")
+                logger.error("Failed to save repository metrics for %s/%s - response: %r",
+                             repo_owner, repo_name, getattr(response, 'data', 'No data'))
             
             return success
             
@@ -618,21 +694,180 @@ class DataStore:
             logger.error(f"Error updating GitHub token: {str(e)}")
             return False
 
+    # ------------------------------------------------------------------
+    # Async read API - lets callers issue several reads concurrently
+    # ------------------------------------------------------------------
+
+    def _session_tokens(self) -> Optional[Tuple[str, str]]:
+        """Get the (access_token, refresh_token) of the current session, if it has both"""
+        session = self._session
+        if isinstance(session, dict):
+            access_token, refresh_token = session.get('access_token'), session.get('refresh_token')
+        else:
+            # get_session() stores the Supabase Session object itself
+            access_token, refresh_token = getattr(session, 'access_token', None), getattr(session, 'refresh_token', None)
+        if access_token and refresh_token:
+            return access_token, refresh_token
+        return None
+
+    async def _get_async_client(self) -> AsyncClient:
+        """Get the async Supabase client bound to the running event loop, authenticated
+        with the same user session as the sync client"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = None
+            self._async_lock = asyncio.Lock()
+            self._async_loop = loop
+
+        # Reads started together by gather() must not query before the session is applied
+        async with self._async_lock:
+            tokens = self._session_tokens()
+            if self._async_client is None or (tokens is None and self._async_session_tokens is not None):
+                # Also rebuilt after sign out, so the previous user's JWT is not reused
+                http_client = httpx.AsyncClient(
+                    http2=True,
+                    timeout=SUPABASE_HTTP_TIMEOUT,
+                    limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+                )
+                options = AsyncClientOptions(httpx_client=http_client, postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT)
+                self._async_client = await acreate_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+                self._async_session_tokens = None
+
+            if tokens is not None and tokens != self._async_session_tokens:
+                try:
+                    await self._async_client.auth.set_session(
+                        access_token=tokens[0],
+                        refresh_token=tokens[1]
+                    )
+                    self._async_session_tokens = tokens
+                    logger.info("Successfully set Supabase auth session on async client")
+                except Exception as e:
+                    logger.warning(f"Could not set Supabase auth session on async client: {e}")
+            return self._async_client
+
+    def _session_email(self) -> Optional[str]:
+        """Get the email of the authenticated session user, if any"""
+        if self._session and 'user' in self._session and 'email' in self._session['user']:
+            return self._session['user']['email']
+        return None
+
+    async def aget_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Async version of get_user_by_email"""
+        client = await self._get_async_client()
+        try:
+            response = await client.rpc('get_user_by_email', {'user_email': email}).execute()
+            if response.data and len(response.data) > 0:
+                return response.data[0]
+            return None
+        except Exception as e:
+            logger.error(f"Error getting user by email: {str(e)}")
+            try:
+                response = await client.table('users').select('*').eq('email', email).execute()
+                if response.data:
+                    return response.data[0]
+                return None
+            except Exception as fallback_e:
+                logger.error(f"Fallback query also failed: {str(fallback_e)}")
+                return None
+
+    async def aget_user_repos(self, user_id: str) -> List[Dict[str, Any]]:
+        """Async version of get_user_repos"""
+        user_email = self._session_email()
+        if not user_email:
+            logger.warning(f"No session email available, cannot retrieve repos for user_id {user_id}")
+            return []
+        try:
+            client = await self._get_async_client()
+            response = await client.rpc('get_user_repos_data', {'user_email': user_email}).execute()
+            if response.data:
+                logger.info(f"Retrieved {len(response.data)} repos for user {user_email}")
+                return _transform_user_repos(response.data)
+            logger.info(f"No repos found for user {user_email}")
+            return []
+        except Exception as e:
+            logger.error(f"Error getting user repos: {str(e)}")
+            return []
+
+    async def aget_user_metrics(self, user_id: str, limit: int = 30) -> List[Dict[str, Any]]:
+        """Async version of get_user_metrics"""
+        user_email = self._session_email()
+        if not user_email:
+            logger.warning(f"No session email available, cannot retrieve metrics for user_id {user_id}")
+            return []
+        try:
+            client = await self._get_async_client()
+            response = await client.rpc('get_user_metrics_data', {
+                'user_email': user_email,
+                'limit_count': limit
+            }).execute()
+            if response.data:
+                logger.info(f"Retrieved {len(response.data)} user metrics for {user_email}")
+                return response.data
+            logger.warning(f"No metrics found for user {user_email}")
+            return []
+        except Exception as e:
+            logger.error(f"Error getting user metrics: {str(e)}")
+            return []
+
+    async def aget_repo_metrics(self, repo_owner: str, repo_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Async version of get_repo_metrics"""
+        repo_full_name = f"{repo_owner}/{repo_name}"
+        try:
+            client = await self._get_async_client()
+            repo_response = await client.table('repos').select("*").eq('full_name', repo_full_name).execute()
+            if not repo_response.data:
+                logger.warning(f"Repository {repo_full_name} not found in database")
+                return []
+
+            metrics_response = await client.table('metrics_repo') \
+                .select("*") \
+                .eq('repo_id', repo_response.data[0]['id']) \
+                .order('timestamp', desc=True) \
+                .limit(limit) \
+                .execute()
+            if metrics_response.data:
+                logger.info(f"Retrieved {len(metrics_response.data)} metrics records for {repo_full_name}")
+                return metrics_response.data
+            logger.warning(f"No metrics found for repository {repo_full_name}")
+            return []
+        except Exception as e:
+            logger.error(f"Error getting repository metrics for {repo_owner}/{repo_name}: {str(e)}")
+            return []
+
+    def gather(self, *coroutines) -> List[Any]:
+        """Run several async reads concurrently from synchronous code, e.g.
+        db.gather(db.aget_user_repos(uid), db.aget_user_metrics(uid))"""
+        async def _run():
+            return await asyncio.gather(*coroutines)
+        # Reads run on one background loop so the async client and its
+        # connections survive between calls
+        return asyncio.run_coroutine_threadsafe(_run(), _get_background_loop()).result()
+
+@functools.cache
 def get_datastore() -> DataStore:
     """Get or create a DataStore instance."""
-    if not hasattr(get_datastore, '_instance'):
-        get_datastore._instance = DataStore()
-    return get_datastore._instance
+    return DataStore()
 
 
 class TestDataStore:
     """Mock data store for testing scenarios when real AWS/Supabase config is not available"""
     
+    def __new__(cls, *args, **kwargs):
+        """Return the prebuilt namespace store instead when FAST_MOCK=1"""
+        if os.getenv("FAST_MOCK") == "1":
+            return build_test_store()
+        return super().__new__(cls)
+    
     def __init__(self):
         """Initialize test data store with mock data"""
         self._session = None
         logger.info("TestDataStore initialized for testing")
     
+    @staticmethod
+    def _ok(*args, **kwargs) -> bool:
+        """Mock write - always succeeds"""
+        return True
+    
     def authenticate_with_session_data(self, session_data: Dict[str, Any]) -> bool:
         """Mock authentication - always succeeds"""
         self._session = session_data
@@ -682,39 +917,99 @@ class TestDataStore:
             'github_username': 'test-user'
         }
     
-    def update_user_github_token(self, email: str, github_token: str, github_username: str = None) -> bool:
-        """Mock update - always succeeds"""
-        return True
-    
     def get_user_repos(self, user_id: str) -> List[Dict[str, Any]]:
         """Return empty repo list for testing"""
-        return []
-    
-    def save_user_repo(self, user_email: str, repo_full_name: str) -> bool:
-        """Mock save - always succeeds"""
-        return True
+        return _EMPTY_LIST
     
     def get_user_metrics(self, user_id: str, limit: int = 30) -> List[Dict[str, Any]]:
         """Return empty metrics for testing"""
-        return []
+        return _EMPTY_LIST
     
     def get_repo_metrics(self, repo_owner: str, repo_name: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Return empty repo metrics for testing"""
-        return []
+        return _EMPTY_LIST
     
-    def save_user_metrics(self, email: str, metrics: Dict[str, Any]) -> bool:
-        """Mock save - always succeeds"""
-        logger.info(f"TestDataStore: Mock saved metrics for {email}")
-        return True
+    def get_user_repos_fake(self, n: int) -> List[Mapping[str, Any]]:
+        """Return n read-only mock repo rows sharing one underlying row"""
+        return [_FAKE_REPO] * n
     
-    def save_repo_metrics(self, repo_owner: str, repo_name: str, metrics: Dict[str, Any], user_session: Dict = None) -> bool:
+    def get_user_metrics_fake(self, n: int) -> List[Mapping[str, Any]]:
+        """Return n read-only mock metrics rows sharing one underlying row"""
+        return [_FAKE_METRIC] * n
+    
+    def save_user_metrics(self, email: str, metrics: Dict[str, Any]) -> bool:
         """Mock save - always succeeds"""
+        logger.info("TestDataStore: Mock saved metrics for %s", email)
         return True
     
-    def delete_user_repo_by_id(self, user_repo_id: str) -> bool:
-        """Mock delete - always succeeds"""
+    # Mock writes share one function object instead of one stub per method
+    update_user_github_token = _ok
+    save_user_repo = _ok
+    save_repo_metrics = _ok
+    delete_user_repo_by_id = _ok
+    delete_user_repo = _ok
+
+
+@functools.lru_cache(maxsize=1)
+def make_test_data_store():
+    """Build a DataStore-specced MagicMock with the same canned results as
+    TestDataStore. The mock is created once and reused; call
+    reset_mock(return_value=False, side_effect=True) between tests to drop
+    recorded calls without losing the configured return values."""
+    from unittest.mock import MagicMock
+
+    store = MagicMock(spec=DataStore)
+    store.configure_mock(**{
+        'get_user_repos.return_value': _EMPTY_LIST,
+        'get_user_metrics.return_value': _EMPTY_LIST,
+        'get_repo_metrics.return_value': _EMPTY_LIST,
+        'get_user_github_token.return_value': "mock-github-token",
+        'ensure_user_exists_and_get_id.return_value': "test-user-id",
+        'get_base_url.return_value': "http://localhost:8501",
+        'get_session.return_value': None,
+        'authenticate_with_session_data.return_value': True,
+        'sign_out.return_value': True,
+        'update_user_github_token.return_value': True,
+        'save_user_repo.return_value': True,
+        'save_user_metrics.return_value': True,
+        'save_repo_metrics.return_value': True,
+        'delete_user_repo_by_id.return_value': True,
+        'delete_user_repo.return_value': True,
+    })
+    return store
+
+
+def build_test_store() -> SimpleNamespace:
+    """Build a TestDataStore equivalent as a SimpleNamespace of plain functions,
+    avoiding method binding on every call. Returned by TestDataStore() when
+    FAST_MOCK=1."""
+    store = SimpleNamespace(_session=None)
+
+    def authenticate_with_session_data(session_data):
+        store._session = session_data
         return True
-    
-    def delete_user_repo(self, user_id: str, repo_id: str) -> bool:
-        """Mock delete - always succeeds"""
+
+    def sign_out():
+        store._session = None
         return True
+
+    store.authenticate_with_session_data = authenticate_with_session_data
+    store.sign_out = sign_out
+    store.get_session = lambda: store._session
+    store.get_base_url = lambda: "http://localhost:8501"
+    store.handle_oauth_callback = lambda code: TestDataStore.handle_oauth_callback(store, code)
+    store.get_user_github_token = lambda email: "mock-github-token"
+    store.ensure_user_exists_and_get_id = lambda *_, **__: "test-user-id"
+    store.get_user_by_email = lambda email: TestDataStore.get_user_by_email(store, email)
+    store.get_user_repos = lambda *_, **__: _EMPTY_LIST
+    store.get_user_metrics = lambda *_, **__: _EMPTY_LIST
+    store.get_repo_metrics = lambda *_, **__: _EMPTY_LIST
+    store.get_user_repos_fake = lambda n: [_FAKE_REPO] * n
+    store.get_user_metrics_fake = lambda n: [_FAKE_METRIC] * n
+    store.save_user_metrics = TestDataStore._ok
+    store.update_user_github_token = TestDataStore._ok
+    store.save_user_repo = TestDataStore._ok
+    store.save_repo_metrics = TestDataStore._ok
+    store.delete_user_repo_by_id = TestDataStore._ok
+    store.delete_user_repo = TestDataStore._ok
+    return store
@@ -1,44 +1,956 @@
+"""GitHub GraphQL/REST clients used by the dashboard and background services.
+
+Both clients keep one connection pool for their whole lifetime, opened on
+first request. Use them as context managers so the pool is released:
+
+    with GitHubAPI(token) as api:
+        commits = api.fetch_commits(owner, repo)
+        prs = api.fetch_pull_requests(owner, repo)
+
+    async with AsyncGitHubAPI(token) as api:
+        results = await api.fetch_many(repos)
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import random
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qs
 import time
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Iterator
 from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401 - lets requests/httpx decode br responses
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Only advertise encodings the HTTP clients can actually decode
+ACCEPT_ENCODING = "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+PULL_REQUEST_SUMMARY_FRAGMENT = """
+fragment PullRequestSummary on PullRequest {
+    number
+    title
+    body
+    createdAt
+    mergedAt
+    closedAt
+    updatedAt
+    state
+    author {
+        login
+        ... on User {
+            email
+        }
+    }
+    merged
+    additions
+    deletions
+    changedFiles
+    reviews(first: 20) {
+        totalCount
+        nodes {
+            author {
+                login
+            }
+            submittedAt
+            state
+        }
+    }
+}
+"""
+
+_PULL_REQUESTS_LIST_QUERY = """
+query ($owner: String!, $repo: String!, $cursor: String) {
+    repository(owner: $owner, name: $repo) {
+        pullRequests(first: 100, after: $cursor, states: [MERGED, CLOSED, OPEN], orderBy: {field: UPDATED_AT, direction: DESC}) {
+            nodes {
+                ...PullRequestSummary
+                %s
+            }
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+        }
+    }
+}
+"""
+
+# Without an email filter only the first commit matters (lead time); with one,
+# every commit author is needed to decide whether the PR belongs to the developer.
+PULL_REQUESTS_QUERY = _PULL_REQUESTS_LIST_QUERY % """commits(first: 1) {
+                    totalCount
+                    nodes { commit { committedDate } }
+                }""" + PULL_REQUEST_SUMMARY_FRAGMENT
+
+PULL_REQUESTS_BY_AUTHOR_QUERY = _PULL_REQUESTS_LIST_QUERY % """commits(first: 100) {
+                    totalCount
+                    nodes { commit { committedDate author { email name } } }
+                }""" + PULL_REQUEST_SUMMARY_FRAGMENT
+
+PULL_REQUEST_DETAIL_FRAGMENT = """
+fragment PullRequestDetail on PullRequest {
+    number
+    mergeable
+    commits(first: 100) {
+        totalCount
+        nodes {
+            commit {
+                committedDate
+                additions
+                deletions
+                changedFiles
+                author {
+                    email
+                    name
+                }
+                message
+            }
+        }
+    }
+    reviews(first: 20) {
+        totalCount
+        nodes {
+            author {
+                login
+            }
+            submittedAt
+            state
+            body
+        }
+    }
+    reviewRequests(first: 10) {
+        nodes {
+            requestedReviewer {
+                ... on User {
+                    login
+                }
+            }
+        }
+    }
+    labels(first: 10) {
+        nodes {
+            name
+            color
+        }
+    }
+    assignees(first: 5) {
+        nodes {
+            login
+        }
+    }
+    milestone {
+        title
+        dueOn
+        state
+    }
+}
+"""
+
+PR_DETAIL_BATCH_SIZE = 20
+
+
+COMMIT_FIELDS_FRAGMENT = """
+fragment CommitFields on Commit {
+    oid
+    committedDate
+    additions
+    deletions
+    changedFiles
+    author {
+        email
+        name
+        date
+    }
+    committer {
+        email
+        name
+        date
+    }
+    message
+    messageHeadline
+    messageBody
+}
+"""
+
+# Repositories per aliased activity query; each pulls up to 100 commits and 100 PRs
+ACTIVITY_BATCH_SIZE = 20
+
+
+def _build_commits_query(with_since: bool, with_author: bool, with_until: bool = False) -> str:
+    """Build the default-branch commit history query."""
+    since_variable = ", $since: GitTimestamp!" if with_since else ""
+    until_variable = ", $until: GitTimestamp!" if with_until else ""
+    author_variable = ", $author_email: String!" if with_author else ""
+    since_clause = ", since: $since" if with_since else ""
+    until_clause = ", until: $until" if with_until else ""
+    author_clause = ", author: {emails: [$author_email]}" if with_author else ""
+    return f"""
+    query ($owner: String!, $repo: String!, $cursor: String{since_variable}{until_variable}{author_variable}) {{
+        repository(owner: $owner, name: $repo) {{
+            defaultBranchRef {{
+                target {{
+                    ... on Commit {{
+                        history(first: 100, after: $cursor{since_clause}{until_clause}{author_clause}) {{
+                            nodes {{
+                                ...CommitFields
+                            }}
+                            pageInfo {{
+                                hasNextPage
+                                endCursor
+                            }}
+                        }}
+                    }}
+                }}
+            }}
+        }}
+    }}
+    """ + COMMIT_FIELDS_FRAGMENT
+
+
+# Every (since, author, until) combination, built once at import time
+COMMITS_QUERIES: Dict[Tuple[bool, bool, bool], str] = {
+    (with_since, with_author, with_until): _build_commits_query(with_since, with_author, with_until)
+    for with_since in (False, True)
+    for with_author in (False, True)
+    for with_until in (False, True)
+}
+
+
+def _build_viewer_repos_query(include_private: bool) -> str:
+    """Build the viewer repositories query, optionally restricted to public repos."""
+    privacy_filter = "" if include_private else "privacy: PUBLIC"
+    return f"""
+    query($first: Int!, $cursor: String) {{
+        viewer {{
+            repositories(
+                first: $first,
+                after: $cursor,
+                orderBy: {{field: UPDATED_AT, direction: DESC}}
+                {privacy_filter}
+            ) {{
+                nodes {{
+                    name
+                    owner {{
+                        login
+                    }}
+                    isPrivate
+                    updatedAt
+                    createdAt
+                    description
+                    primaryLanguage {{
+                        name
+                    }}
+                    stargazerCount
+                    forkCount
+                }}
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
+            }}
+        }}
+    }}
+    """
+
+
+def _build_viewer_affiliated_repos_query(include_private: bool) -> str:
+    """Build the viewer repositories query across owner, collaborator and org affiliations."""
+    privacy_filter = "" if include_private else "privacy: PUBLIC"
+    return f"""
+    query($first: Int!, $cursor: String) {{
+        viewer {{
+            repositories(
+                first: $first,
+                after: $cursor,
+                orderBy: {{field: CREATED_AT, direction: DESC}}
+                affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
+                {privacy_filter}
+            ) {{
+                nodes {{
+                    name
+                    owner {{
+                        login
+                    }}
+                    isPrivate
+                    updatedAt
+                    createdAt
+                    description
+                    primaryLanguage {{
+                        name
+                        color
+                    }}
+                    stargazerCount
+                    forkCount
+                }}
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
+            }}
+        }}
+    }}
+    """
+
+
+VIEWER_REPOS_QUERIES = {flag: _build_viewer_repos_query(flag) for flag in (False, True)}
+VIEWER_AFFILIATED_REPOS_QUERIES = {flag: _build_viewer_affiliated_repos_query(flag) for flag in (False, True)}
+
+
+COMMIT_HISTORY_SPAN_QUERY = """
+query ($owner: String!, $repo: String!) {
+    repository(owner: $owner, name: $repo) {
+        createdAt
+        defaultBranchRef {
+            target {
+                ... on Commit {
+                    history {
+                        totalCount
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+REPOSITORY_INSIGHTS_FRAGMENT = """
+fragment RepositoryInsights on Repository {
+    id
+    name
+    owner {
+        login
+    }
+    isPrivate
+    description
+    url
+    createdAt
+    updatedAt
+    pushedAt
+    homepageUrl
+    stargazerCount
+    forkCount
+    watcherCount: watchers {
+        totalCount
+    }
+    openIssues: issues(states: OPEN) {
+        totalCount
+    }
+    closedIssues: issues(states: CLOSED) {
+        totalCount
+    }
+    pullRequests(states: OPEN) {
+        totalCount
+    }
+    pullRequestsMerged: pullRequests(states: MERGED) {
+        totalCount
+    }
+    primaryLanguage {
+        name
+        color
+    }
+    languages(first: 5) {
+        nodes {
+            name
+        }
+    }
+    licenseInfo {
+        name
+        spdxId
+    }
+    repositoryTopics(first: 10) {
+        nodes {
+            topic {
+                name
+            }
+        }
+    }
+    defaultBranchRef {
+        name
+        target {
+            ... on Commit {
+                history {
+                    totalCount
+                }
+            }
+        }
+    }
+    diskUsage
+    codeOfConduct {
+        name
+    }
+    releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+        totalCount
+        nodes {
+            name
+            tagName
+            createdAt
+        }
+    }
+}
+"""
+
+REPOSITORY_INSIGHTS_QUERY = """
+query($owner: String!, $repo: String!) {
+    repository(owner: $owner, name: $repo) {
+        ...RepositoryInsights
+    }
+}
+""" + REPOSITORY_INSIGHTS_FRAGMENT
+
+# Repositories per aliased insights query, to stay under GitHub's node limits
+INSIGHTS_BATCH_SIZE = 25
+
+# Remaining-request floor below which calls wait for the rate limit window to reset
+RATE_LIMIT_FLOOR = 10
+
+# On-disk GraphQL cache shared across processes and restarts. Bump the version
+# whenever a cached query's shape changes so old entries are never read back.
+DISK_CACHE_DIR = os.environ.get("GITHUB_DASHBOARD_CACHE_DIR", os.path.expanduser("~/.cache/github_dashboard"))
+DISK_CACHE_VERSION = "1"
+
+# How long validators for REST responses are kept on disk for revalidation
+REST_CACHE_RETENTION = 7 * 24 * 3600
+
+# Items a SpoolingList keeps in memory before moving them to a temporary file
+SPOOL_THRESHOLD = 50_000
+
+# The search API returns at most 1000 results (10 pages of 100)
+SEARCH_MAX_PAGES = 10
+
+# How long a repository found empty is skipped; it may receive its first push at any time
+EMPTY_REPO_TTL = 600
+
+# Upper bound on concurrent page requests when a REST listing is paginated
+REST_PAGE_WORKERS = 16
+
+# Repositories fetched in parallel by fetch_global_user_activity, and the cap on
+# requests one client has in flight at once (keeps bursts under GitHub's abuse limits)
+ACTIVITY_WORKERS = 10
+MAX_CONCURRENT_REQUESTS = 10
+
+# With several requests in flight the threaded client has to stop earlier, or the
+# requests already sent can overdraw the budget before the headers catch up
+THREADED_RATE_LIMIT_FLOOR = max(RATE_LIMIT_FLOOR, 2 * MAX_CONCURRENT_REQUESTS)
+
+
+def _rate_limit_state(headers) -> Optional[Dict[str, int]]:
+    """Read the remaining budget and reset time from GitHub rate limit headers."""
+    try:
+        return {
+            "remaining": int(headers["X-RateLimit-Remaining"]),
+            "reset": int(headers["X-RateLimit-Reset"])
+        }
+    except (KeyError, ValueError):
+        return None
+
+
+def _throttle_delay(rate: Optional[Dict[str, int]], floor: int = RATE_LIMIT_FLOOR) -> float:
+    """Seconds to wait before the next request so the budget is not exhausted."""
+    if rate and rate["remaining"] < floor:
+        return max(rate["reset"] - time.time(), 0) + random.uniform(0, 1)
+    return 0
+
+
+def _rate_limited_delay(headers) -> float:
+    """Seconds to wait after a 429/secondary 403, preferring Retry-After."""
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        return max(float(retry_after), 1)
+    reset_time = int(headers.get("X-RateLimit-Reset", time.time() + 60))
+    return max(reset_time - time.time(), 1)
+
+
+def _backoff_delay(backoff_factor: int, attempt: int) -> float:
+    """Full-jitter exponential backoff capped at 60 seconds."""
+    return random.uniform(0, min(60, backoff_factor ** attempt))
+
+
+def _build_insights_batch_query(count: int) -> str:
+    """Build one query fetching insights for count repositories via aliases r0..rN."""
+    declarations = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    selections = "\n".join(
+        f"    r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepositoryInsights }}" for i in range(count)
+    )
+    return f"query({declarations}) {{\n{selections}\n}}\n" + REPOSITORY_INSIGHTS_FRAGMENT
+
+
+def _build_pr_detail_batch_query(count: int) -> str:
+    """Build one query fetching full details for count PRs of a repository via aliases p0..pN."""
+    declarations = ", ".join(f"$p{i}: Int!" for i in range(count))
+    selections = "\n".join(
+        f"        p{i}: pullRequest(number: $p{i}) {{ ...PullRequestDetail }}" for i in range(count)
+    )
+    return (
+        f"query($owner: String!, $repo: String!, {declarations}) {{\n"
+        f"    repository(owner: $owner, name: $repo) {{\n{selections}\n    }}\n}}\n"
+    ) + PULL_REQUEST_DETAIL_FRAGMENT
+
+
+def _last_page_number(links: dict) -> int:
+    """Page number of the rel="last" Link header entry, or 1 when absent."""
+    last_url = links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    try:
+        return int(parse_qs(urlparse(last_url).query)["page"][0])
+    except (KeyError, ValueError):
+        return 1
+
+
+def _rest_repo_to_graphql(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST repository object to the GraphQL node shape used elsewhere."""
+    get = repo.get
+    language = get("language")
+    return {
+        "name": get("name"),
+        "owner": {"login": (get("owner") or {}).get("login")},
+        "isPrivate": get("private", False),
+        "updatedAt": get("updated_at"),
+        "createdAt": get("created_at"),
+        "description": get("description"),
+        "primaryLanguage": {"name": language} if language else None,
+        "stargazerCount": get("stargazers_count", 0),
+        "forkCount": get("forks_count", 0),
+    }
+
+
+def _dig(data: Any, *path: str, default: Any = None) -> Any:
+    """Walk nested response dicts along path, returning default if any step is missing or null."""
+    try:
+        for key in path:
+            data = data[key]
+    except (KeyError, TypeError, IndexError):
+        return default
+    return default if data is None else data
+
+
+@functools.cache
+def _get_disk_cache() -> Optional["diskcache.Cache"]:
+    """Process-wide diskcache.Cache, or None when diskcache is unavailable or the directory is unusable."""
+    if not DISKCACHE_AVAILABLE:
+        return None
+    try:
+        return diskcache.Cache(DISK_CACHE_DIR)
+    except Exception as e:
+        logger.warning(f"Disk cache disabled: {e}")
+        return None
+
+
+def _build_activity_batch_query(count: int) -> str:
+    """Build one query fetching the first page of commits and PRs for count repositories via aliases r0..rN."""
+    declarations = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    selections = "\n".join(
+        f"""    r{i}: repository(owner: $o{i}, name: $n{i}) {{
+        defaultBranchRef {{ target {{ ... on Commit {{
+            history(first: 100, since: $since, author: {{emails: [$author_email]}}) {{
+                nodes {{ ...CommitFields }}
+                pageInfo {{ hasNextPage }}
+            }}
+        }} }} }}
+        pullRequests(first: 100, states: [MERGED, CLOSED, OPEN], orderBy: {{field: UPDATED_AT, direction: DESC}}) {{
+            nodes {{
+                ...PullRequestSummary
+                commits(first: 100) {{ totalCount nodes {{ commit {{ committedDate author {{ email name }} }} }} }}
+            }}
+            pageInfo {{ hasNextPage }}
+        }}
+    }}""" for i in range(count)
+    )
+    return (
+        f"query($since: GitTimestamp, $author_email: String!, {declarations}) {{\n{selections}\n}}\n"
+        + COMMIT_FIELDS_FRAGMENT + PULL_REQUEST_SUMMARY_FRAGMENT
+    )
+
+
+def _owner_and_name(repo: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(owner login, name) of a repository node, or None when either is missing."""
+    try:
+        owner, name = repo["owner"]["login"], repo["name"]
+    except (KeyError, TypeError):
+        return None
+    return (owner, name) if owner and name else None
+
+
+def _tag_repository(items: List[Dict[str, Any]], repo_key: str) -> List[Dict[str, Any]]:
+    """Stamp each commit/PR dict in place with its "owner/name" and return the list."""
+    # A plain loop beats map()/setitem tricks and avoids copying every dict
+    for item in items:
+        item["repository"] = repo_key
+    return items
+
+
+def _to_columnar(items: List[Dict[str, Any]]) -> Any:
+    """Convert commit/PR dicts to a pyarrow Table; nested objects become struct columns."""
+    if not items:
+        return pa.table({})
+    return pa.Table.from_pylist(items if isinstance(items, list) else list(items))
+
+
+def _max_age(headers: Any) -> int:
+    """Seconds a response may be reused without revalidation, from Cache-Control max-age."""
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-age" and value.isdigit():
+            return int(value)
+    return 0
+
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a value as compact JSON bytes, using orjson when it is installed."""
+    return orjson.dumps(value) if ORJSON_AVAILABLE else json.dumps(value, separators=(",", ":")).encode()
+
+
+@functools.lru_cache(maxsize=128)
+def _query_body_prefix(query: str) -> bytes:
+    """The serialized {"query": ...} object without its closing brace, reused for every page."""
+    return _dumps({"query": query})[:-1]
+
+
+def _query_body(query: str, variables: Optional[dict]) -> bytes:
+    """Build the GraphQL POST body, serializing only the variables per call."""
+    return _query_body_prefix(query) + b',"variables":' + _dumps(variables or {}) + b"}"
+
+
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+
+def _query_cache_key(query: str, variables: Optional[dict]) -> str:
+    """Hash a GraphQL query and its variables into a cache key."""
+    return hashlib.sha1((query + json.dumps(variables or {}, sort_keys=True)).encode()).hexdigest()
+
+
+def _cutoff_iso(days_back: Optional[int]) -> Optional[str]:
+    """UTC cutoff timestamp in GitHub's ISO-8601 format, or None for no cutoff.
+    
+    GitHub timestamps ("2024-01-15T12:34:56Z") sort lexicographically, so
+    they can be compared against this string directly without parsing.
+    """
+    if days_back is None:
+        return None
+    return (datetime.utcnow() - timedelta(days=days_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _months_ago_iso(months_back: int) -> str:
+    """UTC timestamp exactly months_back calendar months ago, in GitHub's ISO-8601 format."""
+    return (datetime.utcnow() - relativedelta(months=months_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _page_past_cutoff(prs: List[Dict[str, Any]], cutoff_iso: Optional[str]) -> bool:
+    """True once a page ordered by UPDATED_AT DESC has reached PRs older than the cutoff."""
+    return cutoff_iso is not None and (prs[-1].get("updatedAt") or "") < cutoff_iso
+
+
+def _filter_pull_requests(prs: List[Dict[str, Any]], developer_email: Optional[str], cutoff_iso: Optional[str]) -> List[Dict[str, Any]]:
+    """Apply the optional updatedAt cutoff and author-email filters to a page of PRs."""
+    filtered_prs = []
+    for pr in prs:
+        # Apply time filter only if a cutoff is specified
+        if cutoff_iso is not None:
+            updated_at = pr.get("updatedAt")
+            if updated_at and updated_at < cutoff_iso:
+                continue
+        
+        # Filter by email if provided
+        if developer_email:
+            has_user_commits = any(
+                commit.get("commit", {}).get("author", {}).get("email") == developer_email
+                for commit in pr.get("commits", {}).get("nodes", [])
+            )
+            if has_user_commits:
+                filtered_prs.append(pr)
+        else:
+            filtered_prs.append(pr)
+    return filtered_prs
+
+
+class SpoolingList:
+    """Append-only collection that moves its items to a msgpack temp file past a threshold.
+    
+    Supports append/extend, len(), truthiness and repeated iteration, which is
+    all the activity consumers need; spilled items come back as plain dicts.
+    """
+    
+    def __init__(self, threshold: int = SPOOL_THRESHOLD):
+        self._threshold = threshold
+        self._items: List[Any] = []
+        self._file = None
+        self._packer = None
+        self._length = 0
+    
+    def append(self, item: Any) -> None:
+        if self._file is None:
+            self._items.append(item)
+            if len(self._items) > self._threshold:
+                self._spill()
+        else:
+            self._file.write(self._packer.pack(item))
+        self._length += 1
+    
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+    
+    def _spill(self) -> None:
+        logger.info(f"Spooling {len(self._items)} items to disk")
+        self._file = tempfile.TemporaryFile()
+        self._packer = msgpack.Packer()
+        for item in self._items:
+            self._file.write(self._packer.pack(item))
+        self._items = []
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self) -> Iterator[Any]:
+        if self._file is None:
+            yield from self._items
+            return
+        self._file.flush()
+        self._file.seek(0)
+        try:
+            yield from msgpack.Unpacker(self._file, raw=False)
+        finally:
+            # Later appends must land after the existing records
+            self._file.seek(0, os.SEEK_END)
+    
+    def close(self) -> None:
+        """Delete the backing file, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._items = []
+            self._length = 0
+
+
 class GitHubAPI:
     """Enhanced GitHub API with improved error handling and advanced queries."""
     
     def __init__(self, token: str):
+        self._token = token
         self.api_url = "https://api.github.com/graphql"
         self.rest_url = "https://api.github.com"
         self.headers = {
             "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Accept": "application/vnd.github.v3+json",
+            "Accept-Encoding": ACCEPT_ENCODING
         }
+        
+        # Keep-alive connection pool shared by every request to api.github.com,
+        # created on first use so constructing a client costs nothing
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        
+        # GraphQL responses for slowly-changing metadata: key -> (expires_at, data)
+        self._query_cache: Dict[str, Tuple[float, dict]] = {}
+        # Disk entries are namespaced per token so users never see each other's data
+        self._disk_cache = _get_disk_cache()
+        self._disk_cache_prefix = f"{DISK_CACHE_VERSION}:{hashlib.sha1(token.encode()).hexdigest()}:"
+        # REST responses for conditional requests: url+params -> entry with etag,
+        # last_modified, data, links and fresh_until (wall-clock, so it can go to disk)
+        self._rest_cache: Dict[str, Dict[str, Any]] = {}
+        # Last seen X-RateLimit-Remaining / X-RateLimit-Reset values per
+        # X-RateLimit-Resource ("graphql", "core", "search" have separate budgets)
+        self._rates: Dict[str, Dict[str, int]] = {}
+        # Cleared while one thread waits out an exhausted budget, so the others hold too
+        self._requests_open = threading.Event()
+        self._requests_open.set()
+        # Identical queries in flight on other threads: key -> Future of the shared result
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._request_slots = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # EnhancedGitHubAPI used for repository discovery, created on first use
+        self._enhanced: Optional["GitHubAPI"] = None
+        # (owner, name) -> expiry time of repositories without a default branch; skipped by activity runs until then
+        self._empty_repos: Dict[Tuple[str, str], float] = {}
+    
+    @property
+    def session(self) -> requests.Session:
+        """The shared requests.Session, created on first access."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers.update(self.headers)
+                    # Transient gateway errors on idempotent requests are retried by urllib3;
+                    # GraphQL POSTs keep their own rate-limit aware retry loop
+                    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+                    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=50, max_retries=retry))
+                    self._session = session
+        return self._session
+    
+    def close(self) -> None:
+        """Release pooled connections; a later request opens a fresh pool."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._enhanced is not None and self._enhanced is not self:
+            self._enhanced.close()
+    
+    def _enhanced_api(self) -> "GitHubAPI":
+        """EnhancedGitHubAPI sharing this client's token, reused across calls."""
+        if self._enhanced is None:
+            # enhanced_github_api subclasses GitHubAPI, so it can't be imported at module load
+            from enhanced_github_api import EnhancedGitHubAPI
+            self._enhanced = self if isinstance(self, EnhancedGitHubAPI) else EnhancedGitHubAPI(self._token)
+        return self._enhanced
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def execute_query(self, query: str, variables: Optional[dict] = None, retries: int = 3, backoff_factor: int = 2,
+                      cache_ttl: Optional[int] = None) -> Optional[dict]:
+        """Executes a GraphQL query, serving it from the TTL cache when cache_ttl is given.
+        
+        Cached queries are looked up in memory, then on disk, then fetched.
+        """
+        cache_key = _query_cache_key(query, variables)
+        if cache_ttl is None:
+            return self._post_query_once(cache_key, query, variables, retries, backoff_factor)
+        
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            expires_at, data = cached
+            if expires_at > time.monotonic():
+                return data
+            del self._query_cache[cache_key]
+        
+        disk_key = self._disk_cache_prefix + cache_key
+        if self._disk_cache is not None:
+            data, disk_expires_at = self._disk_cache.get(disk_key, expire_time=True)
+            if data is not None:
+                remaining = disk_expires_at - time.time() if disk_expires_at else cache_ttl
+                self._query_cache[cache_key] = (time.monotonic() + remaining, data)
+                return data
+        
+        data = self._post_query_once(cache_key, query, variables, retries, backoff_factor)
+        if data is not None:
+            self._query_cache[cache_key] = (time.monotonic() + cache_ttl, data)
+            if self._disk_cache is not None:
+                self._disk_cache.set(disk_key, data, expire=cache_ttl)
+        return data
+    
+    def _post_query_once(self, key: str, query: str, variables: Optional[dict], retries: int, backoff_factor: int) -> Optional[dict]:
+        """Post a query, letting concurrent callers with the same key wait on a single request."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[key] = Future()
+        if not is_owner:
+            return future.result()
+        
+        try:
+            data = self._post_query(query, variables, retries, backoff_factor)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _wait_for_budget(self, resource: str) -> None:
+        """Block until requests against resource may be sent without exhausting its budget."""
+        self._requests_open.wait()
+        delay = _throttle_delay(self._rates.get(resource), THREADED_RATE_LIMIT_FLOOR)
+        if delay:
+            self._pause_requests(delay, f"Rate limit budget for {resource} nearly exhausted")
+    
+    def _pause_requests(self, delay: float, reason: str) -> None:
+        """Hold every thread's requests for delay seconds (or until another pause ends)."""
+        if not self._requests_open.is_set():
+            self._requests_open.wait()
+            return
+        self._requests_open.clear()
+        logger.warning(f"{reason}. Sleeping for {delay:.0f} seconds...")
+        try:
+            time.sleep(delay)
+        finally:
+            self._requests_open.set()
     
-    def execute_query(self, query: str, variables: Optional[dict] = None, retries: int = 3, backoff_factor: int = 2) -> Optional[dict]:
-        """Executes a GraphQL query with enhanced retry logic and rate limit handling."""
+    def _record_rate(self, headers: Any, default_resource: str) -> None:
+        """Remember the budget reported by a response for its rate limit resource."""
+        rate = _rate_limit_state(headers)
+        if rate is not None:
+            self._rates[headers.get("X-RateLimit-Resource", default_resource)] = rate
+    
+    def _post_query(self, query: str, variables: Optional[dict], retries: int, backoff_factor: int) -> Optional[dict]:
+        """Posts a GraphQL query with enhanced retry logic and rate limit handling."""
+        body = _query_body(query, variables)
         attempt = 0
         while attempt < retries:
             try:
-                response = requests.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables or {}},
-                    headers=self.headers
-                )
+                # Wait for the window to reset instead of spending a request on a 403
+                self._wait_for_budget("graphql")
+                
+                with self._request_slots:
+                    response = self.session.post(self.api_url, data=body, headers=JSON_CONTENT_TYPE)
+                self._record_rate(response.headers, "graphql")
                 
                 # Handle rate limiting (429 or secondary 403)
                 if response.status_code == 429 or (response.status_code == 403 and "rate limit" in response.text.lower()):
-                    reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                    sleep_time = max(reset_time - int(time.time()), 60)
-                    logger.warning(f"Rate limited. Sleeping for {sleep_time} seconds...")
-                    time.sleep(sleep_time)
+                    self._pause_requests(_rate_limited_delay(response.headers), "Rate limited")
                     continue
                 
                 response.raise_for_status()
-                data = response.json()
+                data = _loads(response.content)
                 
                 if "errors" in data:
                     error_messages = [e.get("message", "Unknown error") for e in data["errors"]]
@@ -49,14 +961,69 @@ class GitHubAPI:
                 
             except (requests.exceptions.RequestException, ValueError) as e:
                 attempt += 1
-                wait_time = backoff_factor ** attempt
-                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait_time}s...")
+                wait_time = _backoff_delay(backoff_factor, attempt)
+                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait_time:.1f}s...")
                 if attempt < retries:
                     time.sleep(wait_time)
         
         logger.error("All retries failed.")
         return None
     
+    def _rest_get(self, url: str, params: Optional[dict] = None, ttl: Optional[int] = None) -> Any:
+        """GET a REST resource through the conditional-request cache.
+        
+        Entries younger than ttl (or the response's Cache-Control max-age) are
+        served without a request; older ones are revalidated with If-None-Match /
+        If-Modified-Since, and a 304 costs no rate limit.
+        """
+        return self._rest_get_with_links(url, params, ttl)[0]
+    
+    def _rest_get_with_links(self, url: str, params: Optional[dict] = None, ttl: Optional[int] = None) -> Tuple[Any, dict]:
+        """Like _rest_get, but also return the parsed Link header (response.links)."""
+        cache_key = url + "?" + json.dumps(params or {}, sort_keys=True)
+        disk_key = self._disk_cache_prefix + "rest:" + cache_key
+        cached = self._rest_cache.get(cache_key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(disk_key)
+        
+        now = time.time()
+        if cached is not None and cached["fresh_until"] > now:
+            return cached["data"], cached["links"]
+        
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        resource = "search" if "/search/" in url else "core"
+        self._wait_for_budget(resource)
+        with self._request_slots:
+            response = self.session.get(url, params=params, headers=headers)
+        self._record_rate(response.headers, resource)
+        if response.status_code == 429 or (response.status_code == 403 and "rate limit" in response.text.lower()):
+            # Hold other threads too; this request still surfaces as an HTTPError below
+            self._pause_requests(_rate_limited_delay(response.headers), "Rate limited")
+        
+        if response.status_code == 304 and cached is not None:
+            entry = dict(cached, fresh_until=now + (ttl if ttl is not None else _max_age(response.headers)))
+        else:
+            response.raise_for_status()
+            entry = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "data": _loads(response.content),
+                "links": response.links,
+                "fresh_until": now + (ttl if ttl is not None else _max_age(response.headers)),
+            }
+        
+        if entry["etag"] or entry["last_modified"] or entry["fresh_until"] > now:
+            self._rest_cache[cache_key] = entry
+            if self._disk_cache is not None:
+                self._disk_cache.set(disk_key, entry, expire=REST_CACHE_RETENTION)
+        return entry["data"], entry["links"]
+    
     def get_authenticated_user(self) -> Optional[Dict[str, Any]]:
         """Get the authenticated user's profile information."""
         query = """
@@ -91,9 +1058,9 @@ class GitHubAPI:
         }
         """
         
-        data = self.execute_query(query)
+        data = self.execute_query(query, cache_ttl=300)
         if data:
-            return data.get("data", {}).get("viewer")
+            return _dig(data, "data", "viewer")
         return None
     
     def fetch_user_repositories(self, username: Optional[str] = None, limit: int = 200, include_private: bool = True) -> List[Dict[str, Any]]:
@@ -107,18 +1074,7 @@ class GitHubAPI:
         logger.info("🔍 Using enhanced repository discovery for authenticated user...")
         
         try:
-            # Import and use enhanced API
-            import sys
-            import os
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from enhanced_github_api import EnhancedGitHubAPI
-            
-            # Extract token from headers
-            token = self.headers.get("Authorization", "").replace("Bearer ", "")
-            enhanced_api = EnhancedGitHubAPI(token)
-            
-            # Discover all repositories
-            repos = enhanced_api.discover_all_accessible_repositories(include_private)
+            repos = self._enhanced_api().discover_all_accessible_repositories(include_private)
             
             logger.info(f"✅ Enhanced discovery found {len(repos)} repositories")
             return repos[:limit] if limit else repos
@@ -168,12 +1124,13 @@ class GitHubAPI:
         page_count = 0
         
         while page_count < max_pages:
-            data = self.execute_query(query, variables)
+            data = self.execute_query(query, variables, cache_ttl=300)
             if not data:
                 break
             
-            repos = data.get("data", {}).get("user", {}).get("repositories", {}).get("nodes", [])
-            page_info = data.get("data", {}).get("user", {}).get("repositories", {}).get("pageInfo", {})
+            repositories = _dig(data, "data", "user", "repositories", default={})
+            repos = repositories.get("nodes", [])
+            page_info = repositories.get("pageInfo", {})
             
             if not repos:
                 break
@@ -190,39 +1147,7 @@ class GitHubAPI:
     
     def _fetch_basic_user_repos(self, include_private: bool, limit: int) -> List[Dict[str, Any]]:
         """Basic fallback method for fetching user repositories."""
-        privacy_filter = "" if include_private else "privacy: PUBLIC"
-        query = f"""
-        query($first: Int!, $cursor: String) {{
-            viewer {{
-                repositories(
-                    first: $first,
-                    after: $cursor,
-                    orderBy: {{field: UPDATED_AT, direction: DESC}}
-                    {privacy_filter}
-                ) {{
-                    nodes {{
-                        name
-                        owner {{
-                            login
-                        }}
-                        isPrivate
-                        updatedAt
-                        createdAt
-                        description
-                        primaryLanguage {{
-                            name
-                        }}
-                        stargazerCount
-                        forkCount
-                    }}
-                    pageInfo {{
-                        hasNextPage
-                        endCursor
-                    }}
-                }}
-            }}
-        }}
-        """
+        query = VIEWER_REPOS_QUERIES[include_private]
         
         all_repos = []
         variables = {"first": min(limit, 100), "cursor": None}
@@ -234,8 +1159,9 @@ class GitHubAPI:
             if not data:
                 break
             
-            repos = data.get("data", {}).get("viewer", {}).get("repositories", {}).get("nodes", [])
-            page_info = data.get("data", {}).get("viewer", {}).get("repositories", {}).get("pageInfo", {})
+            repositories = _dig(data, "data", "viewer", "repositories", default={})
+            repos = repositories.get("nodes", [])
+            page_info = repositories.get("pageInfo", {})
             
             if not repos:
                 break
@@ -291,41 +1217,7 @@ class GitHubAPI:
             variables = {"username": username, "first": min(limit, 100), "cursor": None}
         else:
             # Query for authenticated user with all affiliations
-            privacy_filter = "" if include_private else "privacy: PUBLIC"
-            query = f"""
-            query($first: Int!, $cursor: String) {{
-                viewer {{
-                    repositories(
-                        first: $first,
-                        after: $cursor,
-                        orderBy: {{field: CREATED_AT, direction: DESC}}
-                        affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]
-                        {privacy_filter}
-                    ) {{
-                        nodes {{
-                            name
-                            owner {{
-                                login
-                            }}
-                            isPrivate
-                            updatedAt
-                            createdAt
-                            description
-                            primaryLanguage {{
-                                name
-                                color
-                            }}
-                            stargazerCount
-                            forkCount
-                        }}
-                        pageInfo {{
-                            hasNextPage
-                            endCursor
-                        }}
-                    }}
-                }}
-            }}
-            """
+            query = VIEWER_AFFILIATED_REPOS_QUERIES[include_private]
             variables = {"first": min(limit, 100), "cursor": None}
         
         all_repos = []
@@ -337,13 +1229,9 @@ class GitHubAPI:
             if not data:
                 break
             
-            repo_data = data.get("data", {})
-            if username:
-                repos = repo_data.get("user", {}).get("repositories", {}).get("nodes", [])
-                page_info = repo_data.get("user", {}).get("repositories", {}).get("pageInfo", {})
-            else:
-                repos = repo_data.get("viewer", {}).get("repositories", {}).get("nodes", [])
-                page_info = repo_data.get("viewer", {}).get("repositories", {}).get("pageInfo", {})
+            repositories = _dig(data, "data", "user" if username else "viewer", "repositories", default={})
+            repos = repositories.get("nodes", [])
+            page_info = repositories.get("pageInfo", {})
             
             if not repos:
                 break
@@ -371,149 +1259,54 @@ class GitHubAPI:
             repo_type = "all" if include_private else "public"
             params = {"per_page": 100, "type": repo_type, "sort": "updated", "affiliation": "owner,collaborator,organization_member"}
         
-        all_repos = []
-        page = 1
         max_pages = 10
         
-        while page <= max_pages:
-            params["page"] = page
-            
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
             try:
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                repos = response.json()
-                
-                if not repos:
-                    break
-                
-                # Convert REST format to GraphQL-like format
-                for repo in repos:
-                    converted_repo = {
-                        "name": repo.get("name"),
-                        "owner": {
-                            "login": repo.get("owner", {}).get("login")
-                        },
-                        "isPrivate": repo.get("private", False),
-                        "updatedAt": repo.get("updated_at"),
-                        "createdAt": repo.get("created_at"),
-                        "description": repo.get("description"),
-                        "primaryLanguage": {
-                            "name": repo.get("language")
-                        } if repo.get("language") else None,
-                        "stargazerCount": repo.get("stargazers_count", 0),
-                        "forkCount": repo.get("forks_count", 0)
-                    }
-                    all_repos.append(converted_repo)
-                
-                page += 1
-                
-                # Check if we got fewer results than requested (last page)
-                if len(repos) < params["per_page"]:
-                    break
-                    
+                return self._rest_get(url, {**params, "page": page}, ttl=60) or []
             except Exception as e:
                 logger.warning(f"REST API page {page} failed: {e}")
-                break
+                return []
         
+        try:
+            first_page, links = self._rest_get_with_links(url, {**params, "page": 1}, ttl=60)
+        except Exception as e:
+            logger.warning(f"REST API page 1 failed: {e}")
+            return []
+        
+        # Page 1's Link header names the last page, so the rest can be fetched in parallel
+        pages = [first_page or []]
+        last_page = min(_last_page_number(links), max_pages)
+        if last_page > 1:
+            with ThreadPoolExecutor(max_workers=min(REST_PAGE_WORKERS, last_page - 1)) as executor:
+                pages.extend(executor.map(fetch_page, range(2, last_page + 1)))
+        
+        all_repos = [_rest_repo_to_graphql(repo) for page in pages for repo in page]
         
         logger.info(f"Basic method found {len(all_repos)} repositories")
         return all_repos
     
-    def fetch_commits(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None) -> List[Dict[str, Any]]:
-        """Fetches ALL commits from repository history (no time limit by default)."""
+    def fetch_commits(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                      since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetches ALL commits from repository history (no time limit by default).
+        
+        since is an ISO-8601 cutoff that takes precedence over days_back.
+        """
         
         # Only apply time filter if explicitly requested
-        since_clause = ""
         variables_base = {
             "owner": owner,
             "repo": repo,
             "cursor": None
         }
         
-        if days_back is not None:
-            since_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
-            since_clause = ", since: $since"
-            variables_base["since"] = since_date
+        since = since or _cutoff_iso(days_back)
+        if since is not None:
+            variables_base["since"] = since
         
+        query = COMMITS_QUERIES[since is not None, bool(developer_email), False]
         if developer_email:
-            query = f"""
-            query ($owner: String!, $repo: String!, $cursor: String{"" if days_back is None else ", $since: GitTimestamp!"}, $author_email: String!) {{
-                repository(owner: $owner, name: $repo) {{
-                    defaultBranchRef {{
-                        target {{
-                            ... on Commit {{
-                                history(first: 100, after: $cursor{since_clause}, author: {{emails: [$author_email]}}) {{
-                                    nodes {{
-                                        oid
-                                        committedDate
-                                        additions
-                                        deletions
-                                        changedFiles
-                                        author {{
-                                            email
-                                            name
-                                            date
-                                        }}
-                                        committer {{
-                                            email
-                                            name
-                                            date
-                                        }}
-                                        message
-                                        messageHeadline
-                                        messageBody
-                                    }}
-                                    pageInfo {{
-                                        hasNextPage
-                                        endCursor
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-            """
             variables_base["author_email"] = developer_email
-        else:
-            query = f"""
-            query ($owner: String!, $repo: String!, $cursor: String{"" if days_back is None else ", $since: GitTimestamp!"}) {{
-                repository(owner: $owner, name: $repo) {{
-                    defaultBranchRef {{
-                        target {{
-                            ... on Commit {{
-                                history(first: 100, after: $cursor{since_clause}) {{
-                                    nodes {{
-                                        oid
-                                        committedDate
-                                        additions
-                                        deletions
-                                        changedFiles
-                                        author {{
-                                            email
-                                            name
-                                            date
-                                        }}
-                                        committer {{
-                                            email
-                                            name
-                                            date
-                                        }}
-                                        message
-                                        messageHeadline
-                                        messageBody
-                                    }}
-                                    pageInfo {{
-                                        hasNextPage
-                                        endCursor
-                                    }}
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-            """
         
         variables = variables_base
         
@@ -526,7 +1319,13 @@ class GitHubAPI:
             if not data:
                 break
             
-            history = data.get("data", {}).get("repository", {}).get("defaultBranchRef", {}).get("target", {}).get("history", {})
+            repository = _dig(data, "data", "repository", default={})
+            if repository.get("defaultBranchRef") is None:
+                # Empty repository: nothing to fetch now or on activity runs within EMPTY_REPO_TTL
+                self._empty_repos[(owner, repo)] = time.monotonic() + EMPTY_REPO_TTL
+                break
+            
+            history = _dig(repository, "defaultBranchRef", "target", "history", default={})
             if not history:
                 break
             
@@ -543,99 +1342,20 @@ class GitHubAPI:
             variables["cursor"] = page_info["endCursor"]
             page_count += 1
         
-        logger.info(f"Fetched {len(commits)} commits for {owner}/{repo} ({'all-time' if days_back is None else f'{days_back} days'})")
+        logger.info(f"Fetched {len(commits)} commits for {owner}/{repo} ({'all-time' if since is None else f'since {since}'})")
         return commits
     
-    def fetch_pull_requests(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None) -> List[Dict[str, Any]]:
-        """Fetches ALL PRs from repository history (no time limit by default)."""
+    def fetch_pull_requests(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                            since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetches ALL PRs from repository history (no time limit by default).
         
-        query = """
-        query ($owner: String!, $repo: String!, $cursor: String) {
-            repository(owner: $owner, name: $repo) {
-                pullRequests(first: 100, after: $cursor, states: [MERGED, CLOSED, OPEN], orderBy: {field: UPDATED_AT, direction: DESC}) {
-                    nodes {
-                        number
-                        title
-                        body
-                        createdAt
-                        mergedAt
-                        closedAt
-                        updatedAt
-                        state
-                        author {
-                            login
-                            ... on User {
-                                email
-                            }
-                        }
-                        mergeable
-                        merged
-                        additions
-                        deletions
-                        changedFiles
-                        commits(first: 100) {
-                            totalCount
-                            nodes {
-                                commit {
-                                    committedDate
-                                    additions
-                                    deletions
-                                    changedFiles
-                                    author {
-                                        email
-                                        name
-                                    }
-                                    message
-                                }
-                            }
-                        }
-                        reviews(first: 20) {
-                            totalCount
-                            nodes {
-                                author {
-                                    login
-                                }
-                                submittedAt
-                                state
-                                body
-                            }
-                        }
-                        reviewRequests(first: 10) {
-                            nodes {
-                                requestedReviewer {
-                                    ... on User {
-                                        login
-                                    }
-                                }
-                            }
-                        }
-                        labels(first: 10) {
-                            nodes {
-                                name
-                                color
-                            }
-                        }
-                        assignees(first: 5) {
-                            nodes {
-                                login
-                            }
-                        }
-                        milestone {
-                            title
-                            dueOn
-                            state
-                        }
-                    }
-                    pageInfo {
-                        hasNextPage
-                        endCursor
-                    }
-                }
-            }
-        }
+        since is an ISO-8601 updatedAt cutoff that takes precedence over days_back.
         """
         
+        query = PULL_REQUESTS_BY_AUTHOR_QUERY if developer_email else PULL_REQUESTS_QUERY
+        
         variables = {"owner": owner, "repo": repo, "cursor": None}
+        cutoff_iso = since or _cutoff_iso(days_back)
         all_prs = []
         max_pages = 20  # Increased to get complete PR history
         page_count = 0
@@ -645,129 +1365,66 @@ class GitHubAPI:
             if not data:
                 break
             
-            prs = data.get("data", {}).get("repository", {}).get("pullRequests", {}).get("nodes", [])
+            pull_requests = _dig(data, "data", "repository", "pullRequests", default={})
+            prs = pull_requests.get("nodes", [])
             if not prs:  # No more PRs
                 break
             
             # Filter by developer email if provided, but no time filtering by default
-            filtered_prs = []
-            for pr in prs:
-                # Apply time filter only if days_back is specified
-                if days_back is not None:
-                    if pr.get("updatedAt"):
-                        updated_date = datetime.strptime(pr["updatedAt"], "%Y-%m-%dT%H:%M:%SZ")
-                        cutoff_date = datetime.now() - timedelta(days=days_back)
-                        if updated_date < cutoff_date:
-                            continue
-                
-                # Filter by email if provided
-                if developer_email:
-                    has_user_commits = any(
-                        commit.get("commit", {}).get("author", {}).get("email") == developer_email
-                        for commit in pr.get("commits", {}).get("nodes", [])
-                    )
-                    if has_user_commits:
-                        filtered_prs.append(pr)
-                else:
-                    filtered_prs.append(pr)
-            
-            all_prs.extend(filtered_prs)
-            
-            page_info = data.get("data", {}).get("repository", {}).get("pullRequests", {}).get("pageInfo", {})
+            all_prs.extend(_filter_pull_requests(prs, developer_email, cutoff_iso))
+            
+            # Pages are sorted by updatedAt, so nothing further back can match
+            if _page_past_cutoff(prs, cutoff_iso):
+                break
+            
+            page_info = pull_requests.get("pageInfo", {})
             if not page_info.get("hasNextPage"):
                 break
                 
             variables["cursor"] = page_info["endCursor"]
             page_count += 1
         
-        logger.info(f"Fetched {len(all_prs)} PRs for {owner}/{repo} ({'all-time' if days_back is None else f'{days_back} days'})")
+        logger.info(f"Fetched {len(all_prs)} PRs for {owner}/{repo} ({'all-time' if cutoff_iso is None else f'since {cutoff_iso}'})")
         return all_prs
     
     def fetch_repository_insights(self, owner: str, repo: str) -> Dict[str, Any]:
         """Fetch comprehensive repository insights and metadata."""
-        query = """
-        query($owner: String!, $repo: String!) {
-            repository(owner: $owner, name: $repo) {
-                id
-                name
-                owner {
-                    login
-                }
-                isPrivate
-                description
-                url
-                createdAt
-                updatedAt
-                pushedAt
-                homepageUrl
-                stargazerCount
-                forkCount
-                watcherCount: watchers {
-                    totalCount
-                }
-                openIssues: issues(states: OPEN) {
-                    totalCount
-                }
-                closedIssues: issues(states: CLOSED) {
-                    totalCount
-                }
-                pullRequests(states: OPEN) {
-                    totalCount
-                }
-                pullRequestsMerged: pullRequests(states: MERGED) {
-                    totalCount
-                }
-                primaryLanguage {
-                    name
-                    color
-                }
-                languages(first: 5) {
-                    nodes {
-                        name
-                    }
-                }
-                licenseInfo {
-                    name
-                    spdxId
-                }
-                repositoryTopics(first: 10) {
-                    nodes {
-                        topic {
-                            name
-                        }
-                    }
-                }
-                defaultBranchRef {
-                    name
-                    target {
-                        ... on Commit {
-                            history {
-                                totalCount
-                            }
-                        }
-                    }
-                }
-                diskUsage
-                codeOfConduct {
-                    name
-                }
-                releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
-                    totalCount
-                    nodes {
-                        name
-                        tagName
-                        createdAt
-                    }
-                }
-            }
-        }
-        """
-        
-        data = self.execute_query(query, {"owner": owner, "repo": repo})
+        data = self.execute_query(REPOSITORY_INSIGHTS_QUERY, {"owner": owner, "repo": repo}, cache_ttl=600)
         if data:
-            return data.get("data", {}).get("repository", {})
+            return _dig(data, "data", "repository", default={})
         return {}
     
+    def fetch_pull_request_details(self, owner: str, repo: str, numbers: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch full commits, review bodies, labels, assignees and milestone for specific PRs."""
+        details = {}
+        for offset in range(0, len(numbers), PR_DETAIL_BATCH_SIZE):
+            batch = numbers[offset:offset + PR_DETAIL_BATCH_SIZE]
+            variables = {"owner": owner, "repo": repo}
+            for i, number in enumerate(batch):
+                variables[f"p{i}"] = number
+            
+            data = self.execute_query(_build_pr_detail_batch_query(len(batch)), variables)
+            repository = _dig(data, "data", "repository", default={})
+            for i, number in enumerate(batch):
+                details[number] = repository.get(f"p{i}") or {}
+        return details
+    
+    def fetch_repository_insights_batch(self, repos: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch insights for many repositories, INSIGHTS_BATCH_SIZE per request."""
+        insights = {}
+        for offset in range(0, len(repos), INSIGHTS_BATCH_SIZE):
+            batch = repos[offset:offset + INSIGHTS_BATCH_SIZE]
+            variables = {}
+            for i, (owner, repo) in enumerate(batch):
+                variables[f"o{i}"] = owner
+                variables[f"n{i}"] = repo
+            
+            data = self.execute_query(_build_insights_batch_query(len(batch)), variables, cache_ttl=600)
+            repositories = _dig(data, "data", default={})
+            for i, key in enumerate(batch):
+                insights[key] = repositories.get(f"r{i}") or {}
+        return insights
+    
     def setup_repository_webhook(self, owner: str, repo: str, webhook_url: str) -> Optional[Dict[str, Any]]:
         """Set up repository webhook for real-time updates. Returns webhook info on success, None on failure."""
         url = f"{self.rest_url}/repos/{owner}/{repo}/hooks"
@@ -782,20 +1439,27 @@ class GitHubAPI:
         }
         
         try:
-            response = requests.post(url, json=payload, headers=self.headers)
+            response = self.session.post(url, json=payload)
             response.raise_for_status()
             logger.info(f"Webhook created for {owner}/{repo} at {webhook_url}")
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return _loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Webhook creation failed: {str(e)}")
             return None
     
-    def fetch_global_user_activity(self, user_email: str, months_back: int = 6) -> Dict[str, Any]:
-        """Fetch global user activity across all accessible repositories"""
+    def fetch_global_user_activity(self, user_email: str, months_back: int = 6, columnar: bool = False,
+                                   spool: bool = False) -> Dict[str, Any]:
+        """Fetch global user activity across all accessible repositories.
+        
+        With columnar=True (and pyarrow installed) commits and pull_requests are
+        returned as pyarrow Tables; call .to_pylist() for the usual dicts. With
+        spool=True (and msgpack installed) they are SpoolingLists that move to a
+        temporary file past SPOOL_THRESHOLD items, bounding memory on huge accounts.
+        """
         try:
             # Calculate date range
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=months_back * 30)
+            start_date = end_date - relativedelta(months=months_back)
             
             # First, get user info to extract username
             user_info = self.get_user_info()
@@ -811,37 +1475,247 @@ class GitHubAPI:
             if not repositories:
                 return {"error": "No repositories found"}
             
-            all_commits = []
-            all_prs = []
+            since = _months_ago_iso(months_back)
+            ordered_repositories = self._order_by_commit_search(repositories, username, since)
+            all_commits, all_prs = self._collect_repo_activity(ordered_repositories, user_email, since, spool)
+            if columnar:
+                all_commits, all_prs = self._columnar_activity(all_commits, all_prs)
             
-            # Fetch data from each repository
+            return {
+                "commits": all_commits,
+                "pull_requests": all_prs,
+                "repositories": repositories,
+                "user_info": user_info,
+                "date_range": {
+                    "start": start_date.isoformat(),
+                    "end": end_date.isoformat()
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error fetching global user activity: {str(e)}")
+            return {"error": str(e)}
+    
+    def _fetch_repo_activity(self, owner: str, name: str, developer_email: Optional[str], since: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch one repository's commits and PRs side by side, tagging each with its "owner/name"."""
+        repo_key = f"{owner}/{name}"
+        # PRs get their own thread: submitting to the caller's pool from one of its
+        # workers could deadlock once every worker is waiting on a queued task
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            prs_future = executor.submit(self.fetch_pull_requests, owner, name, developer_email=developer_email, since=since)
+            commits = self.fetch_commits(owner, name, developer_email=developer_email, since=since)
+            prs = prs_future.result()
+        return _tag_repository(commits, repo_key), _tag_repository(prs, repo_key)
+    
+    def _columnar_activity(self, commits: List[Dict[str, Any]], prs: List[Dict[str, Any]]) -> Tuple[Any, Any]:
+        """Commits and PRs as pyarrow Tables, or unchanged lists when pyarrow is unavailable."""
+        if not PYARROW_AVAILABLE:
+            logger.warning("pyarrow is not installed; returning activity as lists")
+            return commits, prs
+        return _to_columnar(commits), _to_columnar(prs)
+    
+    def _order_by_commit_search(self, repositories: List[Dict[str, Any]], username: str, since: Optional[str]) -> List[Dict[str, Any]]:
+        """Put repositories where the commit search finds commits by username since the cutoff first.
+        
+        The search is only a hint for scan order: it skips forks, only matches
+        commits whose email is linked to the account, and only sees default
+        branches, so every repository is still scanned. If the search fails (it
+        has its own, smaller rate limit) the order is left unchanged.
+        """
+        query = f"author:{username}"
+        if since:
+            query += f" committer-date:>={since[:10]}"
+        
+        active = set()
+        try:
+            for page in range(1, SEARCH_MAX_PAGES + 1):
+                results = self._rest_get(f"{self.rest_url}/search/commits",
+                                         {"q": query, "per_page": 100, "page": page}, ttl=600)
+                items = results.get("items", [])
+                active.update(_dig(item, "repository", "full_name") for item in items)
+                if len(items) < 100:
+                    break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Commit search failed, keeping repository order: {e}")
+            return repositories
+        
+        def searched(repo: Dict[str, Any]) -> bool:
+            key = _owner_and_name(repo)
+            return bool(key) and f"{key[0]}/{key[1]}" in active
+        
+        # Stable sort: searched repositories first, each group in its original order
+        ordered = sorted(repositories, key=lambda repo: not searched(repo))
+        logger.info(f"Commit search found activity in {len(active)} repositories; scanning those first")
+        return ordered
+    
+    def iter_global_user_activity(self, user_email: str, months_back: int = 6) -> Iterator[Dict[str, Any]]:
+        """Yield {"type", "repository", "data"} records as each repository finishes, for progressive rendering.
+        
+        Types are "commit" and "pull_request"; fetch_global_user_activity is the
+        materialized equivalent.
+        """
+        user_info = self.get_user_info()
+        username = user_info.get("login") if user_info else None
+        if not username:
+            logger.error("Error fetching global user activity: failed to get username")
+            return
+        
+        since = _months_ago_iso(months_back)
+        repositories = self._order_by_commit_search(self.fetch_user_repositories(username, limit=50), username, since)
+        for repo_key, commits, prs in self._iter_repo_activity(repositories, user_email, since):
+            for commit in commits:
+                yield {"type": "commit", "repository": repo_key, "data": commit}
+            for pr in prs:
+                yield {"type": "pull_request", "repository": repo_key, "data": pr}
+    
+    def _iter_repo_activity(self, repositories: List[Dict[str, Any]], developer_email: Optional[str],
+                            since: Optional[str]) -> Iterator[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Yield (repo_key, commits, prs) in completion order, ACTIVITY_WORKERS repositories at a time."""
+        executor = ThreadPoolExecutor(max_workers=ACTIVITY_WORKERS)
+        try:
+            futures = {}
             for repo in repositories:
+                key = _owner_and_name(repo)
+                if key is None:
+                    continue
+                if self._empty_repos.get(key, 0) > time.monotonic():
+                    continue
+                owner, name = key
+                future = executor.submit(self._fetch_repo_activity, owner, name, developer_email, since)
+                futures[future] = f"{owner}/{name}"
+            
+            for future in as_completed(futures):
                 try:
-                    owner = repo.get("owner", {}).get("login", "")
-                    name = repo.get("name", "")
-                    
-                    if not owner or not name:
-                        continue
-                    
-                    # Fetch commits for this repo
-                    repo_commits = self.fetch_commits(owner, name, developer_email=user_email, days_back=months_back * 30)
-                    if repo_commits:
-                        # Add repository info to each commit
-                        for commit in repo_commits:
-                            commit["repository"] = f"{owner}/{name}"
-                        all_commits.extend(repo_commits)
-                    
-                    # Fetch PRs for this repo
-                    repo_prs = self.fetch_pull_requests(owner, name, user_email, days_back=months_back * 30)
-                    if repo_prs:
-                        # Add repository info to each PR
-                        for pr in repo_prs:
-                            pr["repository"] = f"{owner}/{name}"
-                        all_prs.extend(repo_prs)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to fetch data for {owner}/{name}: {str(e)}")
+                    commits, prs = future.result()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    # Anything else is a bug and should surface rather than drop a repository
+                    logger.warning(f"Failed to fetch data for {futures[future]}: {str(e)}")
+                    continue
+                yield futures[future], commits, prs
+        finally:
+            # A consumer that stops early shouldn't wait for repositories it will never read
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _collect_repo_activity(self, repositories: List[Dict[str, Any]], developer_email: Optional[str],
+                               since: Optional[str], spool: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch commits and PRs for every repository, ACTIVITY_WORKERS repositories at a time."""
+        if spool and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack is not installed; collecting activity in memory")
+            spool = False
+        all_commits = SpoolingList() if spool else []
+        all_prs = SpoolingList() if spool else []
+        for _, commits, prs in self._iter_repo_activity(repositories, developer_email, since):
+            all_commits.extend(commits)
+            all_prs.extend(prs)
+        return all_commits, all_prs
+    
+    def fetch_global_user_activity_graphql(self, user_email: str, months_back: int = 6) -> Dict[str, Any]:
+        """Like fetch_global_user_activity, but fetching ACTIVITY_BATCH_SIZE repositories per GraphQL request."""
+        try:
+            end_date = datetime.now()
+            start_date = end_date - relativedelta(months=months_back)
+            
+            user_info = self.get_user_info()
+            if not user_info:
+                return {"error": "Failed to get user info"}
+            
+            username = user_info.get("login")
+            if not username:
+                return {"error": "Failed to get username"}
+            
+            repositories = self.fetch_user_repositories(username, limit=50)
+            if not repositories:
+                return {"error": "No repositories found"}
+            
+            since = _months_ago_iso(months_back)
+            ordered_repositories = self._order_by_commit_search(repositories, username, since)
+            all_commits, all_prs = self._collect_repo_activity_batched(ordered_repositories, user_email, since)
+            
+            return {
+                "commits": all_commits,
+                "pull_requests": all_prs,
+                "repositories": repositories,
+                "user_info": user_info,
+                "date_range": {
+                    "start": start_date.isoformat(),
+                    "end": end_date.isoformat()
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error fetching global user activity: {str(e)}")
+            return {"error": str(e)}
+    
+    def _collect_repo_activity_batched(self, repositories: List[Dict[str, Any]], developer_email: str,
+                                       since: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch first pages of commits and PRs with aliased queries.
+        
+        Repositories whose batch failed, or which have more than one page of
+        either, are handed to _collect_repo_activity for full pagination.
+        """
+        cutoff_iso = since
+        all_commits = []
+        all_prs = []
+        remaining = []
+        for offset in range(0, len(repositories), ACTIVITY_BATCH_SIZE):
+            batch = []
+            for repo in repositories[offset:offset + ACTIVITY_BATCH_SIZE]:
+                key = _owner_and_name(repo)
+                if key is not None:
+                    batch.append((repo, key))
+            if not batch:
+                continue
+            variables = {"since": cutoff_iso, "author_email": developer_email}
+            for i, (_, (owner, name)) in enumerate(batch):
+                variables[f"o{i}"] = owner
+                variables[f"n{i}"] = name
+            
+            data = self.execute_query(_build_activity_batch_query(len(batch)), variables)
+            if not data:
+                remaining.extend(repo for repo, _ in batch)
+                continue
+            
+            for i, (repo, (owner, name)) in enumerate(batch):
+                repository = _dig(data, "data", f"r{i}", default={})
+                history = _dig(repository, "defaultBranchRef", "target", "history", default={})
+                pull_requests = repository.get("pullRequests") or {}
+                prs = pull_requests.get("nodes", [])
+                if (_dig(history, "pageInfo", "hasNextPage")
+                        or (_dig(pull_requests, "pageInfo", "hasNextPage") and not (prs and _page_past_cutoff(prs, cutoff_iso)))):
+                    remaining.append(repo)
                     continue
+                
+                repo_key = f"{owner}/{name}"
+                all_commits.extend(_tag_repository(history.get("nodes", []), repo_key))
+                all_prs.extend(_tag_repository(_filter_pull_requests(prs, developer_email, cutoff_iso), repo_key))
+        
+        if remaining:
+            logger.info(f"Paginating {len(remaining)} repositories individually")
+            commits, prs = self._collect_repo_activity(remaining, developer_email, since)
+            all_commits.extend(commits)
+            all_prs.extend(prs)
+        return all_commits, all_prs
+    
+    async def fetch_global_user_activity_async(self, user_email: str, months_back: int = 6) -> Dict[str, Any]:
+        """Async variant of fetch_global_user_activity; all repositories share one HTTP/2 client."""
+        try:
+            end_date = datetime.now()
+            start_date = end_date - relativedelta(months=months_back)
+            
+            # User and repository lookups are cached, so they run on the sync client
+            user_info = await asyncio.to_thread(self.get_user_info)
+            if not user_info:
+                return {"error": "Failed to get user info"}
+            
+            username = user_info.get("login")
+            if not username:
+                return {"error": "Failed to get username"}
+            
+            repositories = await asyncio.to_thread(self.fetch_user_repositories, username, 50)
+            if not repositories:
+                return {"error": "No repositories found"}
+            
+            since = _months_ago_iso(months_back)
+            ordered_repositories = await asyncio.to_thread(self._order_by_commit_search, repositories, username, since)
+            all_commits, all_prs = await self._collect_repo_activity_async(ordered_repositories, user_email, since)
             
             return {
                 "commits": all_commits,
@@ -857,13 +1731,297 @@ class GitHubAPI:
             logger.error(f"Error fetching global user activity: {str(e)}")
             return {"error": str(e)}
     
+    async def _collect_repo_activity_async(self, repositories: List[Dict[str, Any]], developer_email: Optional[str],
+                                           since: Optional[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Async counterpart of _collect_repo_activity, with ACTIVITY_WORKERS requests in flight."""
+        repo_keys = [key for key in map(_owner_and_name, repositories) if key is not None]
+        
+        async with AsyncGitHubAPI(self._token, max_concurrency=ACTIVITY_WORKERS) as api:
+            async def _fetch_repo(owner: str, name: str):
+                return await asyncio.gather(
+                    api.fetch_commits(owner, name, developer_email, since=since),
+                    api.fetch_pull_requests(owner, name, developer_email, since=since)
+                )
+            results = await asyncio.gather(*(_fetch_repo(owner, name) for owner, name in repo_keys), return_exceptions=True)
+        
+        all_commits = []
+        all_prs = []
+        for (owner, name), result in zip(repo_keys, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to fetch data for {owner}/{name}: {str(result)}")
+                continue
+            repo_key = f"{owner}/{name}"
+            commits, prs = result
+            all_commits.extend(_tag_repository(commits, repo_key))
+            all_prs.extend(_tag_repository(prs, repo_key))
+        return all_commits, all_prs
+    
+    def fetch_commits_windowed(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None, windows: int = 8) -> List[Dict[str, Any]]:
+        """Fetch a large commit history by walking time windows concurrently via AsyncGitHubAPI."""
+        async def _fetch():
+            async with AsyncGitHubAPI(self._token) as api:
+                return await api.fetch_commits_windowed(owner, repo, developer_email, days_back, windows)
+        commits = asyncio.run(_fetch())
+        logger.info(f"Fetched {len(commits)} commits for {owner}/{repo} across {windows} windows")
+        return commits
+    
+    def fetch_many(self, repos: List[Tuple[str, str]], developer_email: Optional[str] = None, days_back: int = None) -> Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]]:
+        """Fetch commits and PRs for many repositories concurrently via AsyncGitHubAPI."""
+        async def _fetch():
+            async with AsyncGitHubAPI(self._token) as api:
+                return await api.fetch_many(repos, developer_email, days_back)
+        return asyncio.run(_fetch())
+    
     def get_user_info(self) -> Optional[Dict[str, Any]]:
         """Get authenticated user information"""
         try:
-            url = f"{self.rest_url}/user"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self._rest_get(f"{self.rest_url}/user", ttl=300)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching user info: {str(e)}")
             return None
+
+
+class AsyncGitHubAPI:
+    """Async GraphQL client that overlaps page fetches across many repositories."""
+    
+    def __init__(self, token: str, max_concurrency: int = 64):
+        self.api_url = "https://api.github.com/graphql"
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github.v3+json",
+            "Accept-Encoding": ACCEPT_ENCODING
+        }
+        # One client (and connection pool) for the lifetime of this object, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate: Optional[Dict[str, int]] = None
+        # Identical queries already awaiting a response: key -> Future of the shared result
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared httpx.AsyncClient; over HTTP/2 concurrent queries are multiplexed on one connection."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=256, max_keepalive_connections=64, keepalive_expiry=30),
+                timeout=30
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Release pooled connections; a later request opens a fresh pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+    
+    async def execute_query(self, query: str, variables: Optional[dict] = None, retries: int = 3, backoff_factor: int = 2) -> Optional[dict]:
+        """Executes a GraphQL query, sharing one request between concurrent identical calls."""
+        key = _query_cache_key(query, variables)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._post_query(query, variables, retries, backoff_factor)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+    
+    async def _post_query(self, query: str, variables: Optional[dict], retries: int, backoff_factor: int) -> Optional[dict]:
+        """Posts a GraphQL query with the same retry and rate limit handling as GitHubAPI."""
+        body = _query_body(query, variables)
+        attempt = 0
+        while attempt < retries:
+            try:
+                delay = _throttle_delay(self._rate)
+                if delay:
+                    logger.warning(f"Rate limit budget nearly exhausted. Sleeping for {delay:.0f} seconds...")
+                    await asyncio.sleep(delay)
+                
+                async with self._semaphore:
+                    response = await self.client.post(self.api_url, content=body, headers=JSON_CONTENT_TYPE)
+                self._rate = _rate_limit_state(response.headers) or self._rate
+                
+                # Handle rate limiting (429 or secondary 403)
+                if response.status_code == 429 or (response.status_code == 403 and "rate limit" in response.text.lower()):
+                    sleep_time = _rate_limited_delay(response.headers)
+                    logger.warning(f"Rate limited. Sleeping for {sleep_time:.0f} seconds...")
+                    await asyncio.sleep(sleep_time)
+                    continue
+                
+                response.raise_for_status()
+                data = _loads(response.content)
+                
+                if "errors" in data:
+                    error_messages = [e.get("message", "Unknown error") for e in data["errors"]]
+                    logger.error(f"GraphQL errors: {', '.join(error_messages)}")
+                    raise ValueError(f"GraphQL errors: {', '.join(error_messages)}")
+                
+                return data
+                
+            except (httpx.HTTPError, ValueError) as e:
+                attempt += 1
+                wait_time = _backoff_delay(backoff_factor, attempt)
+                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait_time:.1f}s...")
+                if attempt < retries:
+                    await asyncio.sleep(wait_time)
+        
+        logger.error("All retries failed.")
+        return None
+    
+    async def iter_commits(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                           since: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of commits from the default branch history; since overrides days_back."""
+        since = since or _cutoff_iso(days_back)
+        async for page in self._iter_commit_window(owner, repo, developer_email, since, None):
+            yield page
+    
+    async def _iter_commit_window(self, owner: str, repo: str, developer_email: Optional[str],
+                                  since: Optional[str], until: Optional[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of commits committed between since and until (either may be open)."""
+        query = COMMITS_QUERIES[since is not None, bool(developer_email), until is not None]
+        variables = {"owner": owner, "repo": repo, "cursor": None}
+        if since is not None:
+            variables["since"] = since
+        if until is not None:
+            variables["until"] = until
+        if developer_email:
+            variables["author_email"] = developer_email
+        
+        for _ in range(50):
+            data = await self.execute_query(query, variables)
+            if not data:
+                break
+            
+            history = _dig(data, "data", "repository", "defaultBranchRef", "target", "history", default={})
+            if not history or not history.get("nodes"):
+                break
+            
+            yield history["nodes"]
+            
+            page_info = history.get("pageInfo", {})
+            if not page_info.get("hasNextPage"):
+                break
+            variables["cursor"] = page_info["endCursor"]
+    
+    async def iter_pull_requests(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                                 since: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of PRs, filtered like GitHubAPI.fetch_pull_requests."""
+        query = PULL_REQUESTS_BY_AUTHOR_QUERY if developer_email else PULL_REQUESTS_QUERY
+        variables = {"owner": owner, "repo": repo, "cursor": None}
+        cutoff_iso = since or _cutoff_iso(days_back)
+        
+        for _ in range(20):
+            data = await self.execute_query(query, variables)
+            if not data:
+                break
+            
+            pull_requests = _dig(data, "data", "repository", "pullRequests", default={})
+            prs = pull_requests.get("nodes", [])
+            if not prs:
+                break
+            
+            yield _filter_pull_requests(prs, developer_email, cutoff_iso)
+            
+            if _page_past_cutoff(prs, cutoff_iso):
+                break
+            
+            page_info = pull_requests.get("pageInfo", {})
+            if not page_info.get("hasNextPage"):
+                break
+            variables["cursor"] = page_info["endCursor"]
+    
+    async def fetch_commits(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                            since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch all commit pages into a single list."""
+        commits = []
+        async for page in self.iter_commits(owner, repo, developer_email, days_back, since):
+            commits.extend(page)
+        return commits
+    
+    async def fetch_commits_windowed(self, owner: str, repo: str, developer_email: Optional[str] = None,
+                                     days_back: int = None, windows: int = 8) -> List[Dict[str, Any]]:
+        """Fetch commit history by walking several time windows concurrently.
+        
+        The span from the repository creation date (or the days_back cutoff) to
+        now is split into equal windows whose cursor walks run in parallel. The
+        first and last windows are left open-ended so commits dated before the
+        repository was created, or in the future, are still included.
+        """
+        data = await self.execute_query(COMMIT_HISTORY_SPAN_QUERY, {"owner": owner, "repo": repo})
+        repository = _dig(data, "data", "repository", default={})
+        total_count = _dig(repository, "defaultBranchRef", "target", "history", "totalCount", default=0)
+        if not repository.get("createdAt") or total_count <= 100:
+            # A single page or unknown span - windowing cannot help
+            return await self.fetch_commits(owner, repo, developer_email, days_back)
+        
+        now = datetime.utcnow()
+        start = datetime.strptime(repository["createdAt"], "%Y-%m-%dT%H:%M:%SZ")
+        open_since = None
+        if days_back is not None:
+            cutoff = now - timedelta(days=days_back)
+            open_since = cutoff.strftime('%Y-%m-%dT%H:%M:%SZ')
+            start = max(start, cutoff)
+        
+        windows = max(1, min(windows, total_count // 100))
+        step = (now - start) / windows
+        bounds = [(start + step * i).strftime('%Y-%m-%dT%H:%M:%SZ') for i in range(1, windows)]
+        ranges = list(zip([open_since] + bounds, bounds + [None]))
+        
+        window_semaphore = asyncio.Semaphore(8)
+        
+        async def _fetch_window(since: Optional[str], until: Optional[str]) -> List[Dict[str, Any]]:
+            async with window_semaphore:
+                commits = []
+                async for page in self._iter_commit_window(owner, repo, developer_email, since, until):
+                    commits.extend(page)
+                return commits
+        
+        results = await asyncio.gather(*(_fetch_window(since, until) for since, until in ranges))
+        
+        # Windows share their boundary timestamps, so drop duplicates by oid
+        seen = set()
+        commits = []
+        for window_commits in results:
+            for commit in window_commits:
+                if commit["oid"] not in seen:
+                    seen.add(commit["oid"])
+                    commits.append(commit)
+        commits.sort(key=lambda commit: commit.get("committedDate") or "", reverse=True)
+        return commits
+    
+    async def fetch_pull_requests(self, owner: str, repo: str, developer_email: Optional[str] = None, days_back: int = None,
+                                  since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch all PR pages into a single list."""
+        prs = []
+        async for page in self.iter_pull_requests(owner, repo, developer_email, days_back, since):
+            prs.extend(page)
+        return prs
+    
+    async def fetch_many(self, repos: List[Tuple[str, str]], developer_email: Optional[str] = None, days_back: int = None) -> Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]]:
+        """Fetch commits and PRs for every (owner, repo) pair concurrently."""
+        async def _fetch_repo(owner: str, repo: str) -> Dict[str, List[Dict[str, Any]]]:
+            commits, prs = await asyncio.gather(
+                self.fetch_commits(owner, repo, developer_email, days_back),
+                self.fetch_pull_requests(owner, repo, developer_email, days_back)
+            )
+            return {"commits": commits, "pull_requests": prs}
+        
+        results = await asyncio.gather(*(_fetch_repo(owner, repo) for owner, repo in repos))
+        return dict(zip(repos, results))
@@ -1,12 +1,198 @@
 from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+import functools
+import re
 import statistics
-from typing import Dict, List, Any, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, NamedTuple, Optional, Sequence, Tuple
 import logging
 import numpy as np
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# The metric families are independent; their NumPy work releases the GIL
+METRIC_WORKERS = 4
+
+# Distinct band signatures whose grades are kept; dashboards re-grade the same users and windows
+GRADE_CACHE_SIZE = 512
+
+# Distinct GitHub timestamps kept parsed; bounded so long-lived calculators don't grow without limit
+DATE_CACHE_SIZE = 65536
+
+# Shared read-only default for missing metric sections, instead of a fresh {} per lookup
+EMPTY_MAPPING = MappingProxyType({})
+
+# Points available per grading category, and the percentage each point is worth
+CATEGORY_MAX_SCORES = {"dora": 40, "code_quality": 25, "productivity": 20, "collaboration": 15}
+PERCENT_PER_POINT = {category: 100.0 / max_score for category, max_score in CATEGORY_MAX_SCORES.items()}
+TOTAL_PERCENT_PER_POINT = 100.0 / sum(CATEGORY_MAX_SCORES.values())
+
+# Graded (category, metric) pairs, in the order their scores and explanations are reported
+GRADED_METRICS = [
+    ("dora", "lead_time"),
+    ("dora", "deployment_frequency"),
+    ("dora", "change_failure_rate"),
+    ("dora", "mttr"),
+    ("code_quality", "review_coverage"),
+    ("code_quality", "large_prs"),
+    ("code_quality", "files_per_commit"),
+    ("productivity", "work_life_balance"),
+    ("productivity", "commit_streak"),
+    ("collaboration", "unique_reviewers"),
+    ("collaboration", "review_response_time")
+]
+
+# Letter grades by overall percentage: GRADES[i] applies from GRADE_THRESHOLDS[i - 1] up
+GRADE_THRESHOLDS = [55, 60, 65, 70, 75, 80, 85, 90]
+# The same cut-offs scaled to compare against total_score * 100 with integer math
+SCORE_THRESHOLDS = [threshold * sum(CATEGORY_MAX_SCORES.values()) for threshold in GRADE_THRESHOLDS]
+GRADES = [
+    ("C-", "Significant Improvement Needed"),
+    ("C", "Needs Improvement"),
+    ("C+", "Below Average Performance"),
+    ("B-", "Average Performance"),
+    ("B", "Above Average Performance"),
+    ("B+", "Good Performance"),
+    ("A-", "Very Good Performance"),
+    ("A", "Excellent Performance"),
+    ("A+", "Elite Performance")
+]
+
+# Category messages: below 70% of the category's points, at 80% or more, and the
+# fallback naming the best category when none reaches 80%
+IMPROVEMENT_MESSAGES = {
+    "dora": "Focus on DORA metrics: reduce lead times, increase deployment frequency",
+    "code_quality": "Improve code quality: increase review coverage, create smaller PRs",
+    "productivity": "Enhance productivity: maintain consistent contributions, improve work-life balance",
+    "collaboration": "Strengthen collaboration: engage more reviewers, respond faster to reviews"
+}
+STRENGTH_MESSAGES = {
+    "dora": "Excellent DORA metrics performance - industry-leading delivery capabilities",
+    "code_quality": "Outstanding code quality practices - thorough reviews and well-sized changes",
+    "productivity": "Strong productivity patterns - consistent contributions with good work-life balance",
+    "collaboration": "Exceptional team collaboration - active engagement with multiple reviewers"
+}
+BEST_CATEGORY_MESSAGES = {
+    "dora": "DORA metrics show the most potential for improvement",
+    "code_quality": "Code quality practices are your strongest area",
+    "productivity": "Productivity patterns show consistent development habits",
+    "collaboration": "Collaboration metrics indicate good team interaction"
+}
+
+# Parsed dates are naive UTC, so timestamps are taken against a naive epoch
+EPOCH = datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_github_date(date_str: str) -> Optional[datetime]:
+    """Parse a GitHub timestamp to a naive UTC datetime, or None if unparseable.
+    
+    Cached because the same mergedAt/createdAt strings are read by several calculators.
+    """
+    # Fast path for GitHub's own YYYY-MM-DDTHH:MM:SS[.ffffff]Z: slicing is far cheaper than strptime
+    if date_str[-1:] == "Z" and date_str[10:11] == "T" and (len(date_str) == 20 or date_str[19:20] == "."):
+        try:
+            microsecond = int(date_str[20:-1][:6].ljust(6, "0")) if len(date_str) > 21 else 0
+            return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                            int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]), microsecond)
+        except ValueError:
+            pass
+    
+    try:
+        # Handle different date formats
+        normalized = date_str.replace("Z", "+00:00")
+        
+        # Try to parse with microseconds first
+        try:
+            # Handle microseconds with variable precision
+            if "." in normalized and "+" in normalized:
+                # Split to handle microseconds properly
+                date_part, tz_part = normalized.rsplit("+", 1)
+                if "." in date_part:
+                    base_part, micro_part = date_part.rsplit(".", 1)
+                    # Normalize microseconds to 6 digits
+                    if len(micro_part) > 6:
+                        micro_part = micro_part[:6]
+                    elif len(micro_part) < 6:
+                        micro_part = micro_part.ljust(6, '0')
+                    normalized = f"{base_part}.{micro_part}+{tz_part}"
+            
+            return datetime.strptime(normalized, "%Y-%m-%dT%H:%M:%S.%f%z").replace(tzinfo=None)
+        except ValueError:
+            # Try without microseconds
+            return datetime.strptime(normalized, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
+    except ValueError:
+        try:
+            # Legacy format
+            return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+        except ValueError:
+            return None
+
+
+def _day_counts(timestamps: np.ndarray) -> Iterator[Tuple[datetime, int]]:
+    """(midnight, count) for each distinct UTC day among epoch-second timestamps, in date order."""
+    days, counts = np.unique(np.floor_divide(timestamps, 86400).astype(np.int64), return_counts=True)
+    for day, count in zip(days.tolist(), counts.tolist()):
+        yield EPOCH + timedelta(days=day), count
+
+
+def _most_common(values: np.ndarray, counts: np.ndarray) -> Optional[int]:
+    """Most frequent of values (counts is their bincount), ties going to the one seen first."""
+    if not values.size:
+        return None
+    top = np.flatnonzero(counts == counts.max())
+    return int(values[np.isin(values, top).argmax()])
+
+
+@dataclass
+class PullRequestScan:
+    """Merged-PR columns gathered in one pass for the DORA calculators.
+    
+    Arrays are aligned with merged; missing dates are NaN.
+    """
+    total_prs: int
+    merged: List[Dict]
+    merged_ts: np.ndarray
+    created_ts: np.ndarray
+    first_commit_ts: np.ndarray
+    first_review_ts: np.ndarray
+    last_review_ts: np.ndarray
+    failure_types: List[Optional[str]]
+    is_fix: np.ndarray
+
+
+class GradeResult(NamedTuple):
+    """A computed performance grade; cached and shared, so it leaves the calculator via to_dict()."""
+    overall_grade: str
+    grade_description: str
+    percentage: float
+    total_score: int
+    max_score: int
+    category_scores: Dict[str, int]
+    category_max_scores: Dict[str, int]
+    explanations: Tuple[str, ...]
+    improvement_areas: Tuple[str, ...]
+    strengths: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The grade as the plain dict stored with metrics, with containers of its own."""
+        return {
+            "overall_grade": self.overall_grade,
+            "grade_description": self.grade_description,
+            "percentage": self.percentage,
+            "total_score": self.total_score,
+            "max_score": self.max_score,
+            "category_scores": dict(self.category_scores),
+            "category_max_scores": dict(self.category_max_scores),
+            "explanations": list(self.explanations),
+            "improvement_areas": list(self.improvement_areas),
+            "strengths": list(self.strengths)
+        }
+
+
 class EnhancedMetricsCalculator:
     """Advanced metrics calculator with performance grading and trend analysis."""
     
@@ -32,6 +218,86 @@ class EnhancedMetricsCalculator:
                 "mttr_hours": 168
             }
         }
+        
+        # Score bands per graded metric: (thresholds best-first, points per band, explanation
+        # per band, higher_is_better). Values past the last threshold get the final band.
+        dora_levels = ("elite", "high", "medium")
+        grading_rules = {
+            "lead_time": (
+                [self.benchmarks[level]["lead_time_hours"] for level in dora_levels], [10, 8, 6, 3],
+                ["Elite lead time performance", "High-performing lead time",
+                 "Medium lead time performance", "Lead time needs improvement"], False
+            ),
+            "deployment_frequency": (
+                [self.benchmarks[level]["deployment_frequency_per_week"] for level in dora_levels], [10, 8, 6, 3],
+                ["Elite deployment frequency", "High deployment frequency",
+                 "Good deployment cadence", "Consider increasing deployment frequency"], True
+            ),
+            "change_failure_rate": (
+                [self.benchmarks[level]["change_failure_rate"] for level in dora_levels], [10, 8, 6, 3],
+                ["Elite change success rate", "High-quality changes",
+                 "Acceptable change quality", "Focus on change quality improvement"], False
+            ),
+            "mttr": (
+                [self.benchmarks[level]["mttr_hours"] for level in dora_levels], [10, 8, 6, 3],
+                ["Elite recovery time", "Fast recovery capability",
+                 "Reasonable recovery time", "Improve incident response time"], False
+            ),
+            "review_coverage": (
+                [90, 70], [10, 8, 5],
+                ["Excellent review coverage", "Good review practices", "Increase code review coverage"], True
+            ),
+            "large_prs": (
+                [10, 25], [8, 6, 3],
+                ["Well-sized pull requests", "Consider smaller PRs", "Break down large pull requests"], False
+            ),
+            "files_per_commit": (
+                [5], [7, 4],
+                ["Focused commits", "Consider more focused commits"], False
+            ),
+            "work_life_balance": (
+                [80, 60], [10, 8, 5],
+                ["Excellent work-life balance", "Good work-life balance", "Consider improving work-life balance"], True
+            ),
+            "commit_streak": (
+                [7, 3], [10, 7, 4],
+                ["Great consistency streak", "Good consistency", "Work on consistent contributions"], True
+            ),
+            "unique_reviewers": (
+                [5, 2], [8, 6, 3],
+                ["Strong team collaboration", "Good team interaction", "Expand collaboration network"], True
+            ),
+            "review_response_time": (
+                [24, 72], [7, 5, 2],
+                ["Fast review responses", "Reasonable review timing", "Improve review response time"], False
+            )
+        }
+        # Negating higher-is-better thresholds makes every table ascending, so one
+        # bisect_left finds the band for both "<= threshold" and ">= threshold" rules.
+        # Frozen as tuples: nothing may change them once grades are being cached
+        self._grading_tables = {
+            metric: (tuple(-t if higher else t for t in thresholds), tuple(points), tuple(explanations), -1 if higher else 1)
+            for metric, (thresholds, points, explanations, higher) in grading_rules.items()
+        }
+        
+        # Grades depend only on the band each metric falls in, so repeated band signatures are served from here
+        self._cached_grade = functools.lru_cache(maxsize=GRADE_CACHE_SIZE)(self._grade_from_bands)
+        
+        # Change failure keywords, checked in priority order
+        self.failure_indicators = {
+            "revert": ["revert", "rollback", "undo"],
+            "hotfix": ["hotfix", "emergency", "urgent", "critical"],
+            "bugfix": ["fix", "bug", "issue", "broken", "error"],
+            "patch": ["patch", "quick fix", "band-aid"]
+        }
+        # PR titles treated as fixes when pairing recoveries for MTTR
+        self.recovery_keywords = ["bug", "fix", "issue", "broken", "error", "hotfix"]
+        # One alternation per category scans a PR's text once instead of once per keyword
+        self._failure_patterns = {
+            f_type: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+            for f_type, keywords in self.failure_indicators.items()
+        }
+        self._recovery_pattern = re.compile("|".join(re.escape(keyword) for keyword in self.recovery_keywords))
     
     def calculate_all_metrics(self, commits: List[Dict], pull_requests: List[Dict], scope: str) -> Dict[str, Any]:
         """Calculate comprehensive set of metrics."""
@@ -41,17 +307,24 @@ class EnhancedMetricsCalculator:
         metrics["total_commits"] = len(commits)
         metrics["total_prs"] = len(pull_requests)
         
-        # DORA metrics
-        metrics["dora"] = self.calculate_advanced_dora_metrics(commits, pull_requests)
-        
-        # Code quality
-        metrics["code_quality"] = self.calculate_code_quality_metrics(commits, pull_requests)
-        
-        # Productivity patterns
-        metrics["productivity_patterns"] = self.calculate_productivity_patterns(commits)
-        
-        # Collaboration
-        metrics["collaboration"] = self.calculate_collaboration_metrics(pull_requests)
+        # The four families only read the inputs (memoized fields are idempotent), so run them side by side
+        with ThreadPoolExecutor(max_workers=METRIC_WORKERS) as executor:
+            # DORA metrics
+            dora = executor.submit(self.calculate_advanced_dora_metrics, commits, pull_requests)
+            
+            # Code quality
+            code_quality = executor.submit(self.calculate_code_quality_metrics, commits, pull_requests)
+            
+            # Productivity patterns
+            productivity_patterns = executor.submit(self.calculate_productivity_patterns, commits)
+            
+            # Collaboration
+            collaboration = executor.submit(self.calculate_collaboration_metrics, pull_requests)
+            
+            metrics["dora"] = dora.result()
+            metrics["code_quality"] = code_quality.result()
+            metrics["productivity_patterns"] = productivity_patterns.result()
+            metrics["collaboration"] = collaboration.result()
         
         # Performance grade
         metrics["performance_grade"] = self.get_performance_grade(metrics)
@@ -75,67 +348,69 @@ class EnhancedMetricsCalculator:
     
     def _calculate_weekly_trend(self, data: List[Dict], date_field: str) -> Dict[str, int]:
         """Calculate weekly activity trend."""
-        weekly_counts = defaultdict(int)
+        timestamps = (self._timestamp(item, date_field) for item in data)
+        timestamps = np.fromiter((ts for ts in timestamps if ts is not None), dtype=np.float64)
         
-        for item in data:
-            if date_str := item.get(date_field):
-                try:
-                    date = self._parse_date(date_str)
-                    week_key = date.strftime("%Y-W%U")
-                    weekly_counts[week_key] += 1
-                except Exception:
-                    continue
+        # Format each distinct day once rather than every item; %U weeks split at year ends
+        weekly_counts = defaultdict(int)
+        for date, count in _day_counts(timestamps):
+            weekly_counts[date.strftime("%Y-W%U")] += count
         
         return dict(weekly_counts)
     
     def _parse_date(self, date_str):
         """Parse GitHub date string to datetime object with improved microsecond handling"""
-        try:
-            if isinstance(date_str, str):
-                # Handle different date formats
-                date_str = date_str.replace("Z", "+00:00")
-                
-                # Try to parse with microseconds first
-                try:
-                    # Handle microseconds with variable precision
-                    if "." in date_str and "+" in date_str:
-                        # Split to handle microseconds properly
-                        date_part, tz_part = date_str.rsplit("+", 1)
-                        if "." in date_part:
-                            base_part, micro_part = date_part.rsplit(".", 1)
-                            # Normalize microseconds to 6 digits
-                            if len(micro_part) > 6:
-                                micro_part = micro_part[:6]
-                            elif len(micro_part) < 6:
-                                micro_part = micro_part.ljust(6, '0')
-                            date_str = f"{base_part}.{micro_part}+{tz_part}"
-                    
-                    return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f%z").replace(tzinfo=None)
-                except ValueError:
-                    # Try without microseconds
-                    return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
+        if not isinstance(date_str, str):
             return date_str
-        except ValueError:
-            try:
-                # Legacy format
-                return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            except ValueError:
-                logger.warning(f"Failed to parse date: {date_str}")
-                return datetime.now()
+        parsed = _parse_github_date(date_str)
+        if parsed is None:
+            logger.warning(f"Failed to parse date: {date_str}")
+            return datetime.now()
+        return parsed
+    
+    def _timestamp(self, item: Dict, field: str) -> Optional[float]:
+        """Epoch seconds of item[field], parsed once and memoized on the item as _<field>_ts."""
+        key = f"_{field}_ts"
+        ts = item.get(key)
+        if ts is None:
+            date_str = item.get(field)
+            if not date_str:
+                return None
+            ts = item[key] = (self._parse_date(date_str) - EPOCH).total_seconds()
+        return ts
+    
+    def _lowered(self, item: Dict, field: str) -> str:
+        """Lowercased item[field] (or ""), memoized on the item as _<field>_lower."""
+        key = f"_{field}_lower"
+        text = item.get(key)
+        if text is None:
+            text = item[key] = (item.get(field) or "").lower()
+        return text
+    
+    def _nodes(self, item: Dict, field: str) -> Sequence[Dict]:
+        """item[field]["nodes"], memoized on the item as _<field>; () when absent, so misses allocate nothing."""
+        key = f"_{field}"
+        nodes = item.get(key)
+        if nodes is None:
+            nodes = item[key] = (item.get(field) or {}).get("nodes") or ()
+        return nodes
     
     def calculate_advanced_dora_metrics(self, commits: List[Dict], pull_requests: List[Dict]) -> Dict[str, Any]:
         """Calculate comprehensive DORA metrics with detailed breakdown."""
+        # One pass over the PR dicts feeds all four calculators
+        scan = self._scan_prs(pull_requests)
+        
         # Lead Time for Changes (detailed breakdown)
-        lead_time_data = self._calculate_detailed_lead_time(pull_requests)
+        lead_time_data = self._calculate_detailed_lead_time(scan)
         
         # Deployment Frequency
-        deployment_freq = self._calculate_deployment_frequency(pull_requests)
+        deployment_freq = self._calculate_deployment_frequency(scan)
         
         # Change Failure Rate (enhanced detection)
-        failure_rate = self._calculate_enhanced_failure_rate(pull_requests, commits)
+        failure_rate = self._calculate_enhanced_failure_rate(scan, commits)
         
         # Mean Time to Recovery
-        mttr = self._calculate_mttr(pull_requests, commits)
+        mttr = self._calculate_mttr(scan)
         
         return {
             "lead_time": lead_time_data,
@@ -144,85 +419,99 @@ class EnhancedMetricsCalculator:
             "mttr": mttr
         }
     
-    def _calculate_detailed_lead_time(self, pull_requests: List[Dict]) -> Dict[str, Any]:
-        """Calculate detailed lead time breakdown."""
-        lead_times = []
-        code_times = []  # Time from first commit to PR creation
-        review_times = []  # Time from PR creation to first review
-        merge_times = []  # Time from last review to merge
+    def _scan_prs(self, pull_requests: List[Dict]) -> PullRequestScan:
+        """Collect the dates and classifications of every merged PR in a single pass."""
+        nan = float("nan")
+        merged = []
+        merged_ts = []
+        created_ts = []
+        first_commit_ts = []
+        first_review_ts = []
+        last_review_ts = []
+        failure_types = []
+        is_fix = []
         
         for pr in pull_requests:
-            if not pr.get("mergedAt"):
+            merged_at = self._timestamp(pr, "mergedAt")
+            if merged_at is None:
                 continue
             
-            try:
-                created_at = self._parse_date(pr["createdAt"])
-                merged_at = self._parse_date(pr["mergedAt"])
-                
-                # Get commit dates
-                commits = pr.get("commits", {}).get("nodes", [])
-                if commits:
-                    commit_dates = [
-                        self._parse_date(commit["commit"]["committedDate"])
-                        for commit in commits
-                        if commit.get("commit", {}).get("committedDate")
-                    ]
-                    
-                    if commit_dates:
-                        first_commit = min(commit_dates)
-                        
-                        # Code time: first commit to PR creation
-                        code_time = (created_at - first_commit).total_seconds()
-                        if code_time >= 0:
-                            code_times.append(code_time)
-                        
-                        # Total lead time: first commit to merge
-                        total_lead_time = (merged_at - first_commit).total_seconds()
-                        if total_lead_time >= 0:
-                            lead_times.append(total_lead_time)
-                        
-                        # Review time: PR creation to first review
-                        reviews = pr.get("reviews", {}).get("nodes", [])
-                        if reviews:
-                            review_dates = [
-                                self._parse_date(review["submittedAt"])
-                                for review in reviews
-                                if review.get("submittedAt")
-                            ]
-                            
-                            if review_dates:
-                                first_review = min(review_dates)
-                                review_time = (first_review - created_at).total_seconds()
-                                if review_time >= 0:
-                                    review_times.append(review_time)
-                                
-                                # Merge time: last review to merge
-                                last_review = max(review_dates)
-                                merge_time = (merged_at - last_review).total_seconds()
-                                if merge_time >= 0:
-                                    merge_times.append(merge_time)
-                
-            except Exception as e:
-                logger.warning(f"Failed to calculate lead time for PR: {e}")
-                continue
+            merged.append(pr)
+            merged_ts.append(merged_at)
+            created_at = self._timestamp(pr, "createdAt")
+            created_ts.append(nan if created_at is None else created_at)
+            
+            commit_dates = [
+                self._timestamp(commit["commit"], "committedDate")
+                for commit in self._nodes(pr, "commits")
+                if (commit.get("commit") or {}).get("committedDate")
+            ]
+            review_dates = [
+                self._timestamp(review, "submittedAt")
+                for review in self._nodes(pr, "reviews")
+                if review.get("submittedAt")
+            ]
+            first_commit_ts.append(min(commit_dates) if commit_dates else nan)
+            # Review and merge phases are only measured for PRs with commit dates
+            has_reviews = bool(commit_dates and review_dates)
+            first_review_ts.append(min(review_dates) if has_reviews else nan)
+            last_review_ts.append(max(review_dates) if has_reviews else nan)
+            
+            title = self._lowered(pr, "title")
+            text = f"{title}\n{self._lowered(pr, 'body')}"
+            failure_types.append(next(
+                (f_type for f_type, pattern in self._failure_patterns.items() if pattern.search(text)), None
+            ))
+            is_fix.append(self._recovery_pattern.search(title) is not None)
+        
+        return PullRequestScan(
+            total_prs=len(pull_requests),
+            merged=merged,
+            merged_ts=np.array(merged_ts, dtype=np.float64),
+            created_ts=np.array(created_ts, dtype=np.float64),
+            first_commit_ts=np.array(first_commit_ts, dtype=np.float64),
+            first_review_ts=np.array(first_review_ts, dtype=np.float64),
+            last_review_ts=np.array(last_review_ts, dtype=np.float64),
+            failure_types=failure_types,
+            is_fix=np.array(is_fix, dtype=np.bool_)
+        )
+    
+    def _calculate_detailed_lead_time(self, scan: PullRequestScan) -> Dict[str, Any]:
+        """Calculate detailed lead time breakdown."""
+        # NaN (missing) dates drop out of the >= 0 masks
+        lead_times = scan.merged_ts - scan.first_commit_ts
+        lead_times = lead_times[lead_times >= 0]
+        code_times = scan.created_ts - scan.first_commit_ts  # Time from first commit to PR creation
+        code_times = code_times[code_times >= 0]
+        review_times = scan.first_review_ts - scan.created_ts  # Time from PR creation to first review
+        review_times = review_times[review_times >= 0]
+        merge_times = scan.merged_ts - scan.last_review_ts  # Time from last review to merge
+        merge_times = merge_times[merge_times >= 0]
+        
+        # Each mean is taken once, and all three percentiles come from a single sort
+        lead_avg = float(lead_times.mean()) if lead_times.size else 0.0
+        code_avg = float(code_times.mean()) if code_times.size else 0.0
+        review_avg = float(review_times.mean()) if review_times.size else 0.0
+        merge_avg = float(merge_times.mean()) if merge_times.size else 0.0
+        p50, p90, p95 = np.percentile(lead_times, [50, 90, 95]) / 3600 if lead_times.size else (0, 0, 0)
         
         return {
-            "total_lead_time_sec": self._average(lead_times),
-            "total_lead_time_hours": self._average(lead_times) / 3600 if lead_times else 0,
-            "code_time_sec": self._average(code_times),
-            "code_time_hours": self._average(code_times) / 3600 if code_times else 0,
-            "review_time_sec": self._average(review_times),
-            "review_time_hours": self._average(review_times) / 3600 if review_times else 0,
-            "merge_time_sec": self._average(merge_times),
-            "merge_time_hours": self._average(merge_times) / 3600 if merge_times else 0,
-            "p50_lead_time_hours": self._percentile(lead_times, 50) / 3600 if lead_times else 0,
-            "p90_lead_time_hours": self._percentile(lead_times, 90) / 3600 if lead_times else 0,
-            "p95_lead_time_hours": self._percentile(lead_times, 95) / 3600 if lead_times else 0
+            "total_lead_time_sec": lead_avg,
+            "total_lead_time_hours": lead_avg / 3600 if lead_times.size else 0,
+            "code_time_sec": code_avg,
+            "code_time_hours": code_avg / 3600 if code_times.size else 0,
+            "review_time_sec": review_avg,
+            "review_time_hours": review_avg / 3600 if review_times.size else 0,
+            "merge_time_sec": merge_avg,
+            "merge_time_hours": merge_avg / 3600 if merge_times.size else 0,
+            "p50_lead_time_hours": float(p50),
+            "p90_lead_time_hours": float(p90),
+            "p95_lead_time_hours": float(p95)
         }
     
-    def _calculate_deployment_frequency(self, pull_requests: List[Dict]) -> Dict[str, Any]:
+    def _calculate_deployment_frequency(self, scan: PullRequestScan) -> Dict[str, Any]:
         """Calculate deployment frequency with trends."""
-        if not pull_requests:
+        if not scan.total_prs:
             return {
                 "per_week": 0,
                 "per_day": 0,
@@ -233,17 +522,9 @@ class EnhancedMetricsCalculator:
         weekly_deployments = defaultdict(int)
         daily_deployments = defaultdict(int)
         
-        for pr in pull_requests:
-            if pr.get("mergedAt"):
-                try:
-                    merge_date = self._parse_date(pr["mergedAt"])
-                    week_key = merge_date.strftime("%Y-W%U")
-                    day_key = merge_date.strftime("%Y-%m-%d")
-                    weekly_deployments[week_key] += 1
-                    daily_deployments[day_key] += 1
-                except Exception as e:
-                    logger.warning(f"Failed to parse merge date: {e}")
-                    continue
+        for merge_date, count in _day_counts(scan.merged_ts):
+            weekly_deployments[merge_date.strftime("%Y-W%U")] += count
+            daily_deployments[merge_date.strftime("%Y-%m-%d")] += count
         
         # Calculate averages
         avg_per_week = sum(weekly_deployments.values()) / len(weekly_deployments) if weekly_deployments else 0
@@ -270,48 +551,24 @@ class EnhancedMetricsCalculator:
             "weekly_trend": dict(weekly_deployments),
             "daily_trend": dict(daily_deployments),
             "trend_direction": trend,
-            "total_deployments": len([pr for pr in pull_requests if pr.get("mergedAt")])
+            "total_deployments": len(scan.merged)
         }
     
-    def _calculate_enhanced_failure_rate(self, pull_requests: List[Dict], commits: List[Dict]) -> Dict[str, Any]:
+    def _calculate_enhanced_failure_rate(self, scan: PullRequestScan, commits: List[Dict]) -> Dict[str, Any]:
         """Calculate enhanced change failure rate with detailed analysis."""
-        if not pull_requests:
+        if not scan.total_prs:
             return {
                 "percentage": 0,
                 "failure_types": {},
                 "hotfix_count": 0
             }
         
-        failure_indicators = {
-            "revert": ["revert", "rollback", "undo"],
-            "hotfix": ["hotfix", "emergency", "urgent", "critical"],
-            "bugfix": ["fix", "bug", "issue", "broken", "error"],
-            "patch": ["patch", "quick fix", "band-aid"]
-        }
-        
-        failure_counts = defaultdict(int)
-        total_failures = 0
+        failure_counts = Counter(failure_type for failure_type in scan.failure_types if failure_type)
+        total_failures = sum(failure_counts.values())
         failed_prs = []
         
-        for pr in pull_requests:
-            if not pr.get("mergedAt"):
-                continue
-            
-            title = pr.get("title", "").lower()
-            body = pr.get("body", "").lower()
-            is_failure = False
-            failure_type = None
-            
-            # Check PR title and body for failure indicators
-            for f_type, keywords in failure_indicators.items():
-                if any(keyword in title or keyword in body for keyword in keywords):
-                    failure_counts[f_type] += 1
-                    total_failures += 1
-                    is_failure = True
-                    failure_type = f_type
-                    break
-            
-            if is_failure:
+        for pr, failure_type in zip(scan.merged, scan.failure_types):
+            if failure_type:
                 failed_prs.append({
                     "number": pr.get("number"),
                     "title": pr.get("title"),
@@ -320,13 +577,13 @@ class EnhancedMetricsCalculator:
                 })
         
         # Also check commits for failure patterns
-        hotfix_commits = 0
-        for commit in commits[-50:]:  # Check recent commits
-            message = commit.get("message", "").lower()
-            if any(keyword in message for keyword in failure_indicators["hotfix"]):
-                hotfix_commits += 1
+        hotfix_pattern = self._failure_patterns["hotfix"]
+        hotfix_commits = sum(
+            1 for commit in commits[-50:]  # Check recent commits
+            if hotfix_pattern.search(self._lowered(commit, "message"))
+        )
         
-        failure_rate = (total_failures / len(pull_requests)) * 100 if pull_requests else 0
+        failure_rate = (total_failures / scan.total_prs) * 100
         
         return {
             "percentage": round(failure_rate, 2),
@@ -334,90 +591,69 @@ class EnhancedMetricsCalculator:
             "hotfix_count": hotfix_commits,
             "failed_prs": failed_prs,
             "total_failures": total_failures,
-            "total_prs": len(pull_requests)
+            "total_prs": scan.total_prs
         }
     
-    def _calculate_mttr(self, pull_requests: List[Dict], commits: List[Dict]) -> Dict[str, Any]:
+    def _calculate_mttr(self, scan: PullRequestScan) -> Dict[str, Any]:
         """Calculate Mean Time to Recovery."""
-        recovery_times = []
-        
-        # Look for pairs of failure and fix PRs
-        sorted_prs = sorted(
-            [pr for pr in pull_requests if pr.get("mergedAt")],
-            key=lambda x: self._parse_date(x["mergedAt"])
-        )
+        # Look for pairs of failure and fix PRs in merge order
+        order = np.argsort(scan.merged_ts, kind="stable")
+        merged_ts = scan.merged_ts[order]
+        is_fix = scan.is_fix[order]
         
-        failure_keywords = ["bug", "fix", "issue", "broken", "error", "hotfix"]
+        # Simple heuristic: a fix PR recovers from a failure at the previous deployment
+        gaps = np.diff(merged_ts)
+        recovery_times = gaps[is_fix[1:] & (gaps > 0)]
         
-        for i, pr in enumerate(sorted_prs):
-            title = pr.get("title", "").lower()
-            
-            # If this is a fix PR, look for the original issue
-            if any(keyword in title for keyword in failure_keywords):
-                # Look back for potential failure point
-                failure_time = None
-                fix_time = self._parse_date(pr["mergedAt"])
-                
-                # Simple heuristic: assume failure happened at previous deployment
-                if i > 0:
-                    failure_time = self._parse_date(sorted_prs[i-1]["mergedAt"])
-                    recovery_time = (fix_time - failure_time).total_seconds()
-                    if recovery_time > 0:
-                        recovery_times.append(recovery_time)
-        
-        avg_mttr = self._average(recovery_times) if recovery_times else 0
+        avg_mttr = float(recovery_times.mean()) if recovery_times.size else 0
+        p50, p90 = np.percentile(recovery_times, [50, 90]) / 3600 if recovery_times.size else (0, 0)
         
         return {
             "mttr_sec": avg_mttr,
             "mttr_hours": avg_mttr / 3600 if avg_mttr else 0,
             "mttr_days": avg_mttr / 86400 if avg_mttr else 0,
-            "recovery_incidents": len(recovery_times),
-            "p50_mttr_hours": self._percentile(recovery_times, 50) / 3600 if recovery_times else 0,
-            "p90_mttr_hours": self._percentile(recovery_times, 90) / 3600 if recovery_times else 0
+            "recovery_incidents": int(recovery_times.size),
+            "p50_mttr_hours": float(p50),
+            "p90_mttr_hours": float(p90)
         }
     
     def calculate_code_quality_metrics(self, commits: List[Dict], pull_requests: List[Dict]) -> Dict[str, Any]:
         """Calculate code quality and maintainability metrics."""
         # Commit size analysis
-        commit_sizes = []
-        large_commits = 0
-        
-        for commit in commits:
-            size = (commit.get("additions", 0) + commit.get("deletions", 0))
-            commit_sizes.append(size)
-            if size > 500:  # Large commit threshold
-                large_commits += 1
+        commit_sizes = np.fromiter(
+            (commit.get("additions", 0) + commit.get("deletions", 0) for commit in commits),
+            dtype=np.int64, count=len(commits)
+        )
+        large_commits = int((commit_sizes > 500).sum())  # Large commit threshold
         
         # PR size analysis
-        pr_sizes = []
-        large_prs = 0
-        
-        for pr in pull_requests:
-            size = (pr.get("additions", 0) + pr.get("deletions", 0))
-            pr_sizes.append(size)
-            if size > 1000:  # Large PR threshold
-                large_prs += 1
+        pr_sizes = np.fromiter(
+            (pr.get("additions", 0) + pr.get("deletions", 0) for pr in pull_requests),
+            dtype=np.int64, count=len(pull_requests)
+        )
+        large_prs = int((pr_sizes > 1000).sum())  # Large PR threshold
         
         # Review coverage
-        reviewed_prs = sum(1 for pr in pull_requests if pr.get("reviews", {}).get("nodes"))
+        reviewed_prs = sum(1 for pr in pull_requests if self._nodes(pr, "reviews"))
         review_coverage = (reviewed_prs / len(pull_requests)) * 100 if pull_requests else 0
         
         # Files changed analysis
-        files_changed = []
-        for commit in commits:
-            files_changed.append(commit.get("changedFiles", 0))
+        files_changed = np.fromiter((commit.get("changedFiles", 0) for commit in commits), dtype=np.int64, count=len(commits))
+        
+        # Bucket edges: small < 50 <= medium < 200 <= large
+        small, medium, large = np.histogram(commit_sizes, bins=[np.iinfo(np.int64).min, 50, 200, np.iinfo(np.int64).max])[0]
         
         return {
-            "avg_commit_size": self._average(commit_sizes),
-            "avg_pr_size": self._average(pr_sizes),
+            "avg_commit_size": float(commit_sizes.mean()) if commit_sizes.size else 0.0,
+            "avg_pr_size": float(pr_sizes.mean()) if pr_sizes.size else 0.0,
             "large_commits_percentage": (large_commits / len(commits)) * 100 if commits else 0,
             "large_prs_percentage": (large_prs / len(pull_requests)) * 100 if pull_requests else 0,
             "review_coverage_percentage": round(review_coverage, 2),
-            "avg_files_per_commit": self._average(files_changed),
+            "avg_files_per_commit": float(files_changed.mean()) if files_changed.size else 0.0,
             "commit_size_distribution": {
-                "small": sum(1 for size in commit_sizes if size < 50),
-                "medium": sum(1 for size in commit_sizes if 50 <= size < 200),
-                "large": sum(1 for size in commit_sizes if size >= 200)
+                "small": int(small),
+                "medium": int(medium),
+                "large": int(large)
             }
         }
     
@@ -426,55 +662,40 @@ class EnhancedMetricsCalculator:
         if not commits:
             return {}
         
-        commit_times = []
-        day_counts = defaultdict(int)
-        hour_counts = defaultdict(int)
-        
-        for commit in commits:
-            try:
-                commit_date = self._parse_date(commit["committedDate"])
-                commit_times.append(commit_date)
-                
-                # Day of week (0 = Monday)
-                day_counts[commit_date.weekday()] += 1
-                
-                # Hour of day
-                hour_counts[commit_date.hour] += 1
-            except Exception as e:
-                logger.warning(f"Failed to parse commit date: {e}")
-                continue
+        timestamps = (self._timestamp(commit, "committedDate") for commit in commits)
+        seconds = np.floor(np.fromiter((ts for ts in timestamps if ts is not None), dtype=np.float64)).astype(np.int64)
+        days = seconds // 86400
+        
+        # Histograms in one C pass each; the Unix epoch was a Thursday (weekday 3, Monday = 0)
+        weekdays = (days + 3) % 7
+        hours = (seconds // 3600) % 24
+        day_counts = np.bincount(weekdays, minlength=7)
+        hour_counts = np.bincount(hours, minlength=24)
         
-        # Calculate streaks
-        commit_dates = sorted(set(date.date() for date in commit_times))
-        current_streak = 0
-        max_streak = 0
-        
-        for i, date in enumerate(commit_dates):
-            if i == 0:
-                current_streak = 1
-            else:
-                if (date - commit_dates[i-1]).days == 1:
-                    current_streak += 1
-                else:
-                    current_streak = 1
-            max_streak = max(max_streak, current_streak)
+        # Calculate streaks: runs of consecutive distinct commit days, split wherever the gap isn't one day
+        commit_dates = np.unique(days)
+        breaks = np.flatnonzero(np.diff(commit_dates) != 1)
+        streaks = np.diff(np.concatenate(([-1], breaks, [commit_dates.size - 1])))
+        max_streak = int(streaks.max()) if commit_dates.size else 0
         
         # Work-life balance indicators
-        weekend_commits = day_counts[5] + day_counts[6]  # Saturday + Sunday
-        weekday_commits = sum(day_counts[i] for i in range(5))
+        weekend_commits = int(day_counts[5] + day_counts[6])  # Saturday + Sunday
         weekend_percentage = (weekend_commits / len(commits)) * 100 if commits else 0
         
-        late_night_commits = sum(hour_counts[hour] for hour in range(22, 24)) + sum(hour_counts[hour] for hour in range(0, 6))
+        late_night_commits = int(hour_counts[22:].sum() + hour_counts[:6].sum())
         late_night_percentage = (late_night_commits / len(commits)) * 100 if commits else 0
         
+        # Every weekday and the late-night hours are always reported, even when zero
         return {
-            "commits_by_day": dict(day_counts),
-            "commits_by_hour": dict(hour_counts),
+            "commits_by_day": {day: int(count) for day, count in enumerate(day_counts)},
+            "commits_by_hour": {
+                hour: int(count) for hour, count in enumerate(hour_counts) if count or hour >= 22 or hour < 6
+            },
             "weekend_work_percentage": round(weekend_percentage, 2),
             "late_night_work_percentage": round(late_night_percentage, 2),
             "max_commit_streak": max_streak,
-            "most_productive_day": max(day_counts, key=day_counts.get) if day_counts else None,
-            "most_productive_hour": max(hour_counts, key=hour_counts.get) if hour_counts else None,
+            "most_productive_day": _most_common(weekdays, day_counts),
+            "most_productive_hour": _most_common(hours, hour_counts),
             "work_life_balance_score": max(0, 100 - weekend_percentage - late_night_percentage)
         }
     
@@ -483,322 +704,160 @@ class EnhancedMetricsCalculator:
         if not pull_requests:
             return {}
         
-        reviewers = []
-        review_response_times = []
-        pr_authors = []
+        # Review distribution, counted as we go; its keys are the unique reviewers
+        reviewer_counts = Counter()
+        # (PR created, review submitted) epoch seconds per counted review; NaN when missing
+        created_ts = []
+        submitted_ts = []
+        pr_authors = set()
+        nan = float("nan")
         
         for pr in pull_requests:
             author = pr.get("author", {}).get("login")
             if author:
-                pr_authors.append(author)
+                pr_authors.add(author)
             
-            reviews = pr.get("reviews", {}).get("nodes", [])
-            for review in reviews:
+            for review in self._nodes(pr, "reviews"):
                 reviewer = review.get("author", {}).get("login")
                 if reviewer and reviewer != author:
-                    reviewers.append(reviewer)
-                    
-                    # Calculate review response time
-                    try:
-                        pr_created = self._parse_date(pr["createdAt"])
-                        review_submitted = self._parse_date(review["submittedAt"])
-                        response_time = (review_submitted - pr_created).total_seconds()
-                        if response_time > 0:
-                            review_response_times.append(response_time)
-                    except Exception as e:
-                        logger.warning(f"Failed to calculate review response time: {e}")
+                    reviewer_counts[reviewer] += 1
+                    pr_created = self._timestamp(pr, "createdAt")
+                    review_submitted = self._timestamp(review, "submittedAt")
+                    created_ts.append(nan if pr_created is None else pr_created)
+                    submitted_ts.append(nan if review_submitted is None else review_submitted)
         
-        # Unique collaborators
-        unique_reviewers = len(set(reviewers))
-        unique_authors = len(set(pr_authors))
+        # Review response times in one subtraction; NaN and non-positive gaps drop out
+        response_times = np.array(submitted_ts, dtype=np.float64) - np.array(created_ts, dtype=np.float64)
+        response_times = response_times[response_times > 0]
         
-        # Review distribution
-        reviewer_counts = Counter(reviewers)
+        # Unique collaborators
+        unique_reviewers = len(reviewer_counts)
+        unique_authors = len(pr_authors)
+        total_reviews = sum(reviewer_counts.values())
         
         return {
             "unique_reviewers": unique_reviewers,
             "unique_authors": unique_authors,
-            "avg_review_response_time_hours": self._average(review_response_times) / 3600 if review_response_times else 0,
-            "total_reviews": len(reviewers),
-            "reviews_per_pr": len(reviewers) / len(pull_requests) if pull_requests else 0,
+            "avg_review_response_time_hours": float(response_times.mean()) / 3600 if response_times.size else 0,
+            "total_reviews": total_reviews,
+            "reviews_per_pr": total_reviews / len(pull_requests) if pull_requests else 0,
             "top_reviewers": dict(reviewer_counts.most_common(5)),
             "collaboration_index": unique_reviewers * unique_authors  # Simple collaboration metric
         }
     
     def get_performance_grade(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate comprehensive performance grade with detailed breakdown."""
-        scores = {}
-        max_scores = {}
-        explanations = []
-        
-        # DORA Metrics Scoring (40% of total)
-        dora_score = 0
-        dora_max = 40
-        
-        # Lead time (10 points)
-        lead_time_hours = metrics.get("dora", {}).get("lead_time", {}).get("total_lead_time_hours", 0)
-        if lead_time_hours <= self.benchmarks["elite"]["lead_time_hours"]:
-            dora_score += 10
-            explanations.append("Elite lead time performance")
-        elif lead_time_hours <= self.benchmarks["high"]["lead_time_hours"]:
-            dora_score += 8
-            explanations.append("High-performing lead time")
-        elif lead_time_hours <= self.benchmarks["medium"]["lead_time_hours"]:
-            dora_score += 6
-            explanations.append("Medium lead time performance")
-        else:
-            dora_score += 3
-            explanations.append("Lead time needs improvement")
-        
-        # Deployment frequency (10 points)
-        deploy_freq = metrics.get("dora", {}).get("deployment_frequency", {}).get("per_week", 0)
-        if deploy_freq >= self.benchmarks["elite"]["deployment_frequency_per_week"]:
-            dora_score += 10
-            explanations.append("Elite deployment frequency")
-        elif deploy_freq >= self.benchmarks["high"]["deployment_frequency_per_week"]:
-            dora_score += 8
-            explanations.append("High deployment frequency")
-        elif deploy_freq >= self.benchmarks["medium"]["deployment_frequency_per_week"]:
-            dora_score += 6
-            explanations.append("Good deployment cadence")
-        else:
-            dora_score += 3
-            explanations.append("Consider increasing deployment frequency")
-        
-        # Change failure rate (10 points)
-        failure_rate = metrics.get("dora", {}).get("change_failure_rate", {}).get("percentage", 0)
-        if failure_rate <= self.benchmarks["elite"]["change_failure_rate"]:
-            dora_score += 10
-            explanations.append("Elite change success rate")
-        elif failure_rate <= self.benchmarks["high"]["change_failure_rate"]:
-            dora_score += 8
-            explanations.append("High-quality changes")
-        elif failure_rate <= self.benchmarks["medium"]["change_failure_rate"]:
-            dora_score += 6
-            explanations.append("Acceptable change quality")
-        else:
-            dora_score += 3
-            explanations.append("Focus on change quality improvement")
-        
-        # MTTR (10 points)
-        mttr_hours = metrics.get("dora", {}).get("mttr", {}).get("mttr_hours", 0)
-        if mttr_hours <= self.benchmarks["elite"]["mttr_hours"]:
-            dora_score += 10
-            explanations.append("Elite recovery time")
-        elif mttr_hours <= self.benchmarks["high"]["mttr_hours"]:
-            dora_score += 8
-            explanations.append("Fast recovery capability")
-        elif mttr_hours <= self.benchmarks["medium"]["mttr_hours"]:
-            dora_score += 6
-            explanations.append("Reasonable recovery time")
-        else:
-            dora_score += 3
-            explanations.append("Improve incident response time")
-        
-        scores["dora"] = dora_score
-        max_scores["dora"] = dora_max
-        
-        # Code Quality Scoring (25% of total)
-        quality_score = 0
-        quality_max = 25
-        
-        review_coverage = metrics.get("code_quality", {}).get("review_coverage_percentage", 0)
-        if review_coverage >= 90:
-            quality_score += 10
-            explanations.append("Excellent review coverage")
-        elif review_coverage >= 70:
-            quality_score += 8
-            explanations.append("Good review practices")
-        else:
-            quality_score += 5
-            explanations.append("Increase code review coverage")
-        
-        large_prs_pct = metrics.get("code_quality", {}).get("large_prs_percentage", 0)
-        if large_prs_pct <= 10:
-            quality_score += 8
-            explanations.append("Well-sized pull requests")
-        elif large_prs_pct <= 25:
-            quality_score += 6
-            explanations.append("Consider smaller PRs")
-        else:
-            quality_score += 3
-            explanations.append("Break down large pull requests")
-        
-        avg_files_per_commit = metrics.get("code_quality", {}).get("avg_files_per_commit", 0)
-        if avg_files_per_commit <= 5:
-            quality_score += 7
-            explanations.append("Focused commits")
-        else:
-            quality_score += 4
-            explanations.append("Consider more focused commits")
-        
-        scores["code_quality"] = quality_score
-        max_scores["code_quality"] = quality_max
-        
-        # Productivity Patterns (20% of total)
-        productivity_score = 0
-        productivity_max = 20
-        
-        work_life_balance = metrics.get("productivity_patterns", {}).get("work_life_balance_score", 0)
-        if work_life_balance >= 80:
-            productivity_score += 10
-            explanations.append("Excellent work-life balance")
-        elif work_life_balance >= 60:
-            productivity_score += 8
-            explanations.append("Good work-life balance")
-        else:
-            productivity_score += 5
-            explanations.append("Consider improving work-life balance")
-        
-        commit_streak = metrics.get("productivity_patterns", {}).get("max_commit_streak", 0)
-        if commit_streak >= 7:
-            productivity_score += 10
-            explanations.append("Great consistency streak")
-        elif commit_streak >= 3:
-            productivity_score += 7
-            explanations.append("Good consistency")
-        else:
-            productivity_score += 4
-            explanations.append("Work on consistent contributions")
-        
-        scores["productivity"] = productivity_score
-        max_scores["productivity"] = productivity_max
-        
-        # Collaboration (15% of total)
-        collaboration_score = 0
-        collaboration_max = 15
-        
-        unique_reviewers = metrics.get("collaboration", {}).get("unique_reviewers", 0)
-        if unique_reviewers >= 5:
-            collaboration_score += 8
-            explanations.append("Strong team collaboration")
-        elif unique_reviewers >= 2:
-            collaboration_score += 6
-            explanations.append("Good team interaction")
-        else:
-            collaboration_score += 3
-            explanations.append("Expand collaboration network")
-        
-        review_response_time = metrics.get("collaboration", {}).get("avg_review_response_time_hours", 0)
-        if review_response_time <= 24:
-            collaboration_score += 7
-            explanations.append("Fast review responses")
-        elif review_response_time <= 72:
-            collaboration_score += 5
-            explanations.append("Reasonable review timing")
-        else:
-            collaboration_score += 2
-            explanations.append("Improve review response time")
-        
-        scores["collaboration"] = collaboration_score
-        max_scores["collaboration"] = collaboration_max
+        bands = tuple(
+            self._band(metric, value) for (_, metric), value in zip(GRADED_METRICS, self._graded_values(metrics))
+        )
+        return self._cached_grade(bands).to_dict()
+    
+    def get_performance_grades(self, metrics_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Grade many metric dicts (e.g. a team or org cohort) at once.
+        
+        Every user's bands for a metric come from one np.searchsorted over that
+        metric's column; the results match get_performance_grade for each dict.
+        """
+        if not metrics_list:
+            return []
+        
+        values = np.array([self._graded_values(metrics) for metrics in metrics_list], dtype=np.float64)
+        bands = np.empty(values.shape, dtype=np.int64)
+        for column, (_, metric) in enumerate(GRADED_METRICS):
+            thresholds, _, _, sign = self._grading_tables[metric]
+            # NaN sorts past every threshold, landing in the worst band like the scalar path
+            bands[:, column] = np.searchsorted(thresholds, sign * values[:, column], side="left")
+        
+        return [self._cached_grade(tuple(row)).to_dict() for row in bands.tolist()]
+    
+    def _graded_values(self, metrics: Dict[str, Any]) -> Tuple[float, ...]:
+        """The scalars graded by get_performance_grade, in GRADED_METRICS order."""
+        dora = metrics.get("dora") or EMPTY_MAPPING
+        code_quality = metrics.get("code_quality") or EMPTY_MAPPING
+        productivity = metrics.get("productivity_patterns") or EMPTY_MAPPING
+        collaboration = metrics.get("collaboration") or EMPTY_MAPPING
+        
+        return (
+            (dora.get("lead_time") or EMPTY_MAPPING).get("total_lead_time_hours", 0),
+            (dora.get("deployment_frequency") or EMPTY_MAPPING).get("per_week", 0),
+            (dora.get("change_failure_rate") or EMPTY_MAPPING).get("percentage", 0),
+            (dora.get("mttr") or EMPTY_MAPPING).get("mttr_hours", 0),
+            code_quality.get("review_coverage_percentage", 0),
+            code_quality.get("large_prs_percentage", 0),
+            code_quality.get("avg_files_per_commit", 0),
+            productivity.get("work_life_balance_score", 0),
+            productivity.get("max_commit_streak", 0),
+            collaboration.get("unique_reviewers", 0),
+            collaboration.get("avg_review_response_time_hours", 0)
+        )
+    
+    def _band(self, metric: str, value: float) -> int:
+        """Index of the score band value falls in for metric (0 = best)."""
+        thresholds, _, _, sign = self._grading_tables[metric]
+        if value != value:
+            # NaN meets no threshold, so it takes the last band
+            return len(thresholds)
+        return bisect_left(thresholds, sign * value)
+    
+    def _grade_from_bands(self, bands: Tuple[int, ...]) -> GradeResult:
+        """Build the full grade from each graded metric's band, in GRADED_METRICS order."""
+        # Category points (DORA 40%, code quality 25%, productivity 20%, collaboration 15%)
+        scores = dict.fromkeys(CATEGORY_MAX_SCORES, 0)
+        max_scores = dict(CATEGORY_MAX_SCORES)
+        
+        for (category, metric), band in zip(GRADED_METRICS, bands):
+            scores[category] += self._grading_tables[metric][1][band]
+        explanations = tuple(
+            self._grading_tables[metric][2][band] for (_, metric), band in zip(GRADED_METRICS, bands)
+        )
         
         # Calculate overall grade
         total_score = sum(scores.values())
         total_max = sum(max_scores.values())
-        percentage = (total_score / total_max) * 100
-        
-        if percentage >= 90:
-            grade = "A+"
-            grade_description = "Elite Performance"
-        elif percentage >= 85:
-            grade = "A"
-            grade_description = "Excellent Performance"
-        elif percentage >= 80:
-            grade = "A-"
-            grade_description = "Very Good Performance"
-        elif percentage >= 75:
-            grade = "B+"
-            grade_description = "Good Performance"
-        elif percentage >= 70:
-            grade = "B"
-            grade_description = "Above Average Performance"
-        elif percentage >= 65:
-            grade = "B-"
-            grade_description = "Average Performance"
-        elif percentage >= 60:
-            grade = "C+"
-            grade_description = "Below Average Performance"
-        elif percentage >= 55:
-            grade = "C"
-            grade_description = "Needs Improvement"
-        else:
-            grade = "C-"
-            grade_description = "Significant Improvement Needed"
-        
-        return {
-            "overall_grade": grade,
-            "grade_description": grade_description,
-            "percentage": round(percentage, 1),
-            "total_score": total_score,
-            "max_score": total_max,
-            "category_scores": scores,
-            "category_max_scores": max_scores,
-            "explanations": explanations,
-            "improvement_areas": self._get_improvement_recommendations(scores, max_scores),
-            "strengths": self._get_strengths(scores, max_scores)
-        }
-    
-    def _get_improvement_recommendations(self, scores: Dict[str, int], max_scores: Dict[str, int]) -> List[str]:
-        """Generate specific improvement recommendations."""
-        recommendations = []
+        percentage = total_score * TOTAL_PERCENT_PER_POINT
         
-        for category, score in scores.items():
-            max_score = max_scores[category]
-            percentage = (score / max_score) * 100
-            
-            if percentage < 70:
-                if category == "dora":
-                    recommendations.append("Focus on DORA metrics: reduce lead times, increase deployment frequency")
-                elif category == "code_quality":
-                    recommendations.append("Improve code quality: increase review coverage, create smaller PRs")
-                elif category == "productivity":
-                    recommendations.append("Enhance productivity: maintain consistent contributions, improve work-life balance")
-                elif category == "collaboration":
-                    recommendations.append("Strengthen collaboration: engage more reviewers, respond faster to reviews")
-        
-        return recommendations
-    
-    def _get_strengths(self, scores: Dict[str, int], max_scores: Dict[str, int]) -> List[str]:
-        """Identify top performing metric categories based on percentage of max score."""
-        strengths = []
+        grade, grade_description = GRADES[bisect_right(SCORE_THRESHOLDS, total_score * 100)]
         
-        for category, score in scores.items():
-            max_score = max_scores[category]
-            percentage = (score / max_score) * 100
-            
-            if percentage >= 80:
-                if category == "dora":
-                    strengths.append("Excellent DORA metrics performance - industry-leading delivery capabilities")
-                elif category == "code_quality":
-                    strengths.append("Outstanding code quality practices - thorough reviews and well-sized changes")
-                elif category == "productivity":
-                    strengths.append("Strong productivity patterns - consistent contributions with good work-life balance")
-                elif category == "collaboration":
-                    strengths.append("Exceptional team collaboration - active engagement with multiple reviewers")
+        # Percent cut-offs checked as score * 100 against cut-off * max, all in integers
+        improvement_areas = tuple(
+            IMPROVEMENT_MESSAGES[c] for c, score in scores.items() if score * 100 < 70 * max_scores[c]
+        )
+        strengths = tuple(STRENGTH_MESSAGES[c] for c, score in scores.items() if score * 100 >= 80 * max_scores[c])
         
         # If no major strengths, identify the best performing area
         if not strengths and scores:
-            best_category = max(scores.items(), key=lambda x: x[1] / max_scores[x[0]])[0]
-            if best_category == "dora":
-                strengths.append("DORA metrics show the most potential for improvement")
-            elif best_category == "code_quality":
-                strengths.append("Code quality practices are your strongest area")
-            elif best_category == "productivity":
-                strengths.append("Productivity patterns show consistent development habits")
-            elif best_category == "collaboration":
-                strengths.append("Collaboration metrics indicate good team interaction")
-        
-        return strengths
+            best = max(scores, key=lambda category: scores[category] * PERCENT_PER_POINT[category])
+            strengths = (BEST_CATEGORY_MESSAGES[best],)
+        
+        return GradeResult(
+            overall_grade=grade,
+            grade_description=grade_description,
+            percentage=round(percentage, 1),
+            total_score=total_score,
+            max_score=total_max,
+            category_scores=scores,
+            category_max_scores=max_scores,
+            explanations=explanations,
+            improvement_areas=improvement_areas,
+            strengths=strengths
+        )
     
+    # Plain Python on purpose: these see short lists, where building an ndarray costs more than the math
     def _average(self, values: List[float]) -> float:
         """Return the average of a list of values, or 0.0 if empty."""
-        return float(np.mean(values)) if values else 0.0
+        return sum(values) / len(values) if values else 0.0
     
     def _percentile(self, values: List[float], percentile: int) -> float:
-        """Return the given percentile of a list of values, or 0.0 if empty."""
-        return float(np.percentile(values, percentile)) if values else 0.0
+        """Return the given percentile of a list of values (linear interpolation), or 0.0 if empty."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        k = (len(ordered) - 1) * percentile / 100
+        f = int(k)
+        if f == k:
+            return float(ordered[f])
+        return ordered[f] + (ordered[f + 1] - ordered[f]) * (k - f)
     
     def _median(self, values: List[float]) -> float:
         """Return the median of a list of values, or 0.0 if empty."""
-        return float(np.median(values)) if values else 0.0
+        return float(statistics.median(values)) if values else 0.0
@@ -7,10 +7,16 @@ from sklearn.cluster import KMeans
 from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
 from datetime import datetime, timedelta, date
 import logging
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Set
 import warnings
+import atexit
+import copy
+import weakref
 import pickle
+import joblib
 import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from statsmodels.tsa.arima.model import ARIMA
@@ -22,6 +28,12 @@ except ImportError:
 warnings.filterwarnings('ignore')
 logger = logging.getLogger(__name__)
 
+def _flush_at_exit(analyzer_ref):
+    """Write an analyzer's pending checkpoints at exit, if the analyzer is still alive."""
+    analyzer = analyzer_ref()
+    if analyzer is not None:
+        analyzer.flush_models()
+
 class EnhancedMLAnalyzer:
     """Advanced ML analyzer with continuous learning capabilities and performance tracking."""
     
@@ -35,59 +47,137 @@ class EnhancedMLAnalyzer:
     MODEL_SAVE_PATH = "ml_models"  # Directory to save/load models
     LEARNING_RATE = 0.01  # For SGD models
     MAX_MODEL_AGE_DAYS = 30  # Retrain full model if older than this
+    PERFORMANCE_HISTORY_SIZE = 50  # Incremental update records kept per model
+    TRAIN_WINDOW_DAYS = 90  # History used when a failed incremental update falls back to retraining
+    MODEL_COMPRESS_LEVEL = 3  # zlib level for saved models
+    MAX_IN_MEMORY_MODELS = 16  # Trained models kept in memory; others are reloaded from disk when used
+    SAVE_EVERY_N_UPDATES = 10  # Checkpoint incrementally updated models every N updates
     
     def __init__(self):
         self.scalers = {}
+        self._scaler_params = {}  # (mean, scale) of each fitted scaler, applied without sklearn's per-call checks
         self.models = {}
         self.anomaly_detectors = {}
         self.trend_analyzers = {}
         self.model_metadata = {}  # Track training history, performance, etc.
         self.performance_history = {}  # Track model performance over time
         self.last_training_data = {}  # Cache last training data for incremental updates
+        self._resident_models = OrderedDict()  # Metrics held in memory, least recently used first
+        
+        # Model files are written by one background thread, in submission order; the executor
+        # joins its worker at interpreter exit, so queued saves still complete
+        self._save_executor = ThreadPoolExecutor(max_workers=1)
+        self._unsaved_updates = set()  # Metrics with incremental updates not yet checkpointed
+        atexit.register(_flush_at_exit, weakref.ref(self))
         
-        # Ensure model save directory exists
+        # Ensure model save directory exists; saved models are loaded on first use by _get_model
         if not os.path.exists(self.MODEL_SAVE_PATH):
             os.makedirs(self.MODEL_SAVE_PATH)
             
-        # Load existing models if available
-        self._load_existing_models()
+    def _get_model(self, metric_name: str) -> Optional[Dict]:
+        """Return the model info for a metric, loading a saved model from disk on first use."""
+        if metric_name not in self.models:
+            model_file = f"{metric_name}.pkl"
+            if not os.path.exists(os.path.join(self.MODEL_SAVE_PATH, model_file)):
+                return None
+                
+            # An evicted model may still be queued for writing; let the save thread catch up first
+            self._wait_for_saves()
+            _, model_data = self._load_one_model(model_file)
+            if model_data is None:
+                return None
+                
+            self.models[metric_name] = model_data.get('model')
+            self.model_metadata[metric_name] = model_data.get('metadata', {})
+            self.scalers[metric_name] = model_data.get('scaler')
+            self.last_training_data[metric_name] = model_data.get('last_data', {})
+            logger.info(f"Loaded existing model for {metric_name}")
+            
+        self._touch_model(metric_name)
+        return self.models.get(metric_name)
+    
+    def _touch_model(self, metric_name: str):
+        """Mark a metric's model as most recently used, evicting the least recently used past MAX_IN_MEMORY_MODELS."""
+        self._resident_models[metric_name] = None
+        self._resident_models.move_to_end(metric_name)
         
-    def _load_existing_models(self):
-        """Load previously trained models from disk for continuous learning."""
+        while len(self._resident_models) > self.MAX_IN_MEMORY_MODELS:
+            evicted, _ = self._resident_models.popitem(last=False)
+            if evicted in self._unsaved_updates:
+                # _save_model snapshots the model, so it can be dropped right away
+                self._save_model(evicted)
+            for registry in (self.models, self.scalers, self._scaler_params, self.model_metadata, self.last_training_data):
+                registry.pop(evicted, None)
+            logger.info(f"Evicted model for {evicted} from memory")
+    
+    def _wait_for_saves(self):
+        """Block until every model save queued so far has been written."""
         try:
-            model_files = [f for f in os.listdir(self.MODEL_SAVE_PATH) if f.endswith('.pkl')]
-            for model_file in model_files:
-                metric_name = model_file.replace('.pkl', '')
-                model_path = os.path.join(self.MODEL_SAVE_PATH, model_file)
-                
-                try:
-                    with open(model_path, 'rb') as f:
-                        model_data = pickle.load(f)
-                        self.models[metric_name] = model_data.get('model')
-                        self.model_metadata[metric_name] = model_data.get('metadata', {})
-                        self.scalers[metric_name] = model_data.get('scaler')
-                        self.last_training_data[metric_name] = model_data.get('last_data', {})
-                        
-                    logger.info(f"Loaded existing model for {metric_name}")
-                except Exception as e:
-                    logger.warning(f"Failed to load model for {metric_name}: {e}")
+            self._save_executor.submit(lambda: None).result()
+        except RuntimeError:
+            # The save thread has shut down, so nothing is left queued
+            pass
+    
+    def _saved_model_names(self) -> Set[str]:
+        """Metric names with a model file in MODEL_SAVE_PATH, once queued saves have been written."""
+        self._wait_for_saves()
+        try:
+            return {f.replace('.pkl', '') for f in os.listdir(self.MODEL_SAVE_PATH) if f.endswith('.pkl')}
+        except OSError as e:
+            logger.warning(f"Failed to list saved models: {e}")
+            return set()
+    
+    def _load_one_model(self, model_file: str) -> Tuple[str, Optional[Dict]]:
+        """Read one saved model file, returning (metric_name, model_data or None on failure)."""
+        metric_name = model_file.replace('.pkl', '')
+        try:
+            # joblib also reads models saved as plain pickles
+            return metric_name, joblib.load(os.path.join(self.MODEL_SAVE_PATH, model_file))
         except Exception as e:
-            logger.warning(f"Failed to load existing models: {e}")
+            logger.warning(f"Failed to load model for {metric_name}: {e}")
+            return metric_name, None
+    
+    def flush_models(self):
+        """Write every model whose latest incremental updates haven't been checkpointed yet."""
+        for metric_name in list(self._unsaved_updates):
+            self._save_model(metric_name)
     
     def _save_model(self, metric_name: str):
-        """Save trained model to disk for persistence."""
+        """Save trained model to disk for persistence, writing the file in the background."""
         try:
-            model_path = os.path.join(self.MODEL_SAVE_PATH, f"{metric_name}.pkl")
-            model_data = {
+            self._unsaved_updates.discard(metric_name)
+            
+            metadata = dict(self.model_metadata.get(metric_name, {}))
+            if 'performance_history' in metadata:
+                # Stored as a plain list so saved models don't depend on the in-memory container
+                metadata['performance_history'] = list(metadata['performance_history'])
+                
+            # Snapshot on the caller's thread: later partial_fit calls update the live model in place
+            model_data = copy.deepcopy({
                 'model': self.models.get(metric_name),
-                'metadata': self.model_metadata.get(metric_name, {}),
+                'metadata': metadata,
                 'scaler': self.scalers.get(metric_name),
                 'last_data': self.last_training_data.get(metric_name, {}),
                 'saved_at': datetime.now().isoformat()
-            }
+            })
+            
+            try:
+                self._save_executor.submit(self._write_model, metric_name, model_data)
+            except RuntimeError:
+                # The save thread is already gone when atexit handlers run; write inline instead
+                self._write_model(metric_name, model_data)
+        except Exception as e:
+            logger.error(f"Failed to save model for {metric_name}: {e}")
+    
+    def _write_model(self, metric_name: str, model_data: Dict[str, Any]):
+        """Compress and write a model snapshot to disk; runs on the save thread."""
+        try:
+            model_path = os.path.join(self.MODEL_SAVE_PATH, f"{metric_name}.pkl")
             
-            with open(model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            # Write beside the target and swap it in, so a crash never leaves a truncated model
+            tmp_path = f"{model_path}.tmp"
+            joblib.dump(model_data, tmp_path, compress=self.MODEL_COMPRESS_LEVEL, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, model_path)
                 
             logger.info(f"Saved model for {metric_name}")
         except Exception as e:
@@ -132,88 +222,53 @@ class EnhancedMLAnalyzer:
         if not historical_data:
             return np.array([]), np.array([]), []
             
-        # Sort by timestamp (try metric_timestamp first, then date)
-        def get_sort_key(x):
-            timestamp = x.get('metric_timestamp') or x.get('date') or x.get('created_at', '1970-01-01')
-            if isinstance(timestamp, str):
-                return timestamp
-            return timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp)
-            
-        sorted_data = sorted(historical_data, key=get_sort_key)
-        timestamps = []
-        values = []
+        values = self._extract_nested_column(historical_data, metric_name)
         
-        for entry in sorted_data:
-            try:
-                # Try metric_timestamp first, fallback to date field
-                timestamp_str = entry.get('metric_timestamp') or entry.get('date')
-                if not timestamp_str:
-                    continue
-                    
-                # Handle different timestamp formats
-                if isinstance(timestamp_str, str):
-                    try:
-                        # Try parsing as full datetime first
-                        timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    except ValueError:
-                        try:
-                            # If that fails, try adding T00:00:00 for date-only strings
-                            timestamp = datetime.fromisoformat(timestamp_str + 'T00:00:00')
-                        except ValueError:
-                            # Skip this entry if we can't parse it
-                            logger.warning(f"Failed to parse timestamp: {timestamp_str}")
-                            continue
-                elif isinstance(timestamp_str, datetime):
-                    # Already a datetime object
-                    timestamp = timestamp_str
-                elif isinstance(timestamp_str, date):
-                    # Date object, convert to datetime
-                    timestamp = datetime.combine(timestamp_str, datetime.min.time())
-                else:
-                    # Try to convert string representation
-                    try:
-                        timestamp = datetime.fromisoformat(str(timestamp_str).replace('Z', '+00:00'))
-                    except ValueError:
-                        logger.warning(f"Failed to parse timestamp: {timestamp_str}")
-                        continue
-                
-                # Try to extract from metrics_data first, then fall back to direct field access
-                metric_value = self._extract_nested_metric(entry.get('metrics_data', {}), metric_name)
-                if metric_value is None:
-                    # Try direct field access
-                    metric_value = entry.get(metric_name)
-                
-                if metric_value is not None:
-                    timestamps.append(timestamp)
-                    values.append(metric_value)
-            except Exception as e:
-                logger.warning(f"Failed to parse entry: {e}")
-                continue
+        # Only rows that carry the metric need their timestamp parsed
+        timestamps = []
+        rows = []
+        for i in np.flatnonzero(~np.isnan(values)).tolist():
+            # Try metric_timestamp first, fallback to date field
+            entry = historical_data[i]
+            timestamp = self._parse_timestamp(entry.get('metric_timestamp') or entry.get('date'))
+            if timestamp is not None:
+                timestamps.append(timestamp)
+                rows.append(i)
                 
         if not timestamps:
             return np.array([]), np.array([]), []
             
-        # Create features (days since first timestamp)
-        base_time = timestamps[0]
+        # Order chronologically and create features (days since first timestamp) in one vectorized pass;
+        # naive timestamps are taken as UTC so they compare with offset-aware ones
+        instants = pd.to_datetime(timestamps, utc=True)
+        order = np.argsort(instants.values, kind='stable')
+        instants = instants[order]
         
-        # Ensure base_time is datetime for proper arithmetic
-        if isinstance(base_time, date) and not isinstance(base_time, datetime):
-            base_time = datetime.combine(base_time, datetime.min.time())
-            
-        # Convert all timestamps to datetime for consistent arithmetic
-        datetime_timestamps = []
-        for ts in timestamps:
-            if isinstance(ts, datetime):
-                datetime_timestamps.append(ts)
-            elif isinstance(ts, date):
-                datetime_timestamps.append(datetime.combine(ts, datetime.min.time()))
-            else:
-                datetime_timestamps.append(ts)
-                
-        X = np.array([(ts - base_time).days for ts in datetime_timestamps]).reshape(-1, 1)
-        y = np.array(values)
+        X = (instants - instants[0]).days.to_numpy().reshape(-1, 1)
+        y = values[rows][order]
+        
+        return X, y, [timestamps[i] for i in order]
+    
+    def _days_since(self, timestamps: List[datetime], base_time: datetime) -> np.ndarray:
+        """Whole days elapsed from base_time to each timestamp, as a feature column; naive values are taken as UTC."""
+        instants = pd.to_datetime(timestamps, utc=True).values
+        base = pd.to_datetime([base_time], utc=True).values[0]
+        return ((instants - base) // np.timedelta64(1, 'D')).reshape(-1, 1)
+    
+    def _parse_timestamp(self, timestamp: Any) -> Optional[datetime]:
+        """Parse an ISO string, date or datetime into a datetime, or None if it can't be parsed."""
+        if not timestamp:
+            return None
+        if isinstance(timestamp, datetime):
+            return timestamp
+        if isinstance(timestamp, date):
+            return datetime.combine(timestamp, datetime.min.time())
         
-        return X, y, timestamps
+        try:
+            return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
+        except ValueError:
+            logger.warning(f"Failed to parse timestamp: {timestamp}")
+            return None
         
     def train_forecasting_model(self, historical_data: List[Dict], metric_name: str):
         """Train or update forecasting model with continuous learning capabilities."""
@@ -223,28 +278,43 @@ class EnhancedMLAnalyzer:
                 logger.warning(f"Insufficient data for forecasting model training: {len(historical_data)} < {self.MIN_FORECAST_POINTS}")
                 return False
             
+            has_existing_model = self._get_model(metric_name) is not None
+            
+            # Skip everything when the caller passes the same history as last time (e.g. scheduled refreshes)
+            fingerprint = self._data_fingerprint(historical_data)
+            if has_existing_model and self.last_training_data.get(metric_name, {}).get('fingerprint') == fingerprint:
+                logger.info(f"History unchanged for {metric_name}, using existing model")
+                return True
+            
             # Detect new data points
             new_data = self._detect_new_data_points(historical_data, metric_name)
             has_new_data = len(new_data) >= self.CONTINUOUS_LEARNING_THRESHOLD
             
             # Decide on training strategy
             should_full_retrain = self._should_retrain_full_model(metric_name)
-            has_existing_model = metric_name in self.models
             
             if should_full_retrain or not has_existing_model:
                 logger.info(f"Full retraining for {metric_name} (new model: {not has_existing_model}, age-based: {should_full_retrain})")
-                return self._train_full_model(historical_data, metric_name)
+                trained = self._train_full_model(historical_data, metric_name)
             elif has_new_data:
                 logger.info(f"Incremental learning for {metric_name} with {len(new_data)} new data points")
-                return self._update_model_incrementally(new_data, historical_data, metric_name)
+                trained = self._update_model_incrementally(new_data, historical_data, metric_name)
             else:
                 logger.info(f"No significant new data for {metric_name}, using existing model")
-                return True
+                trained = True
+                
+            if trained:
+                self.last_training_data.setdefault(metric_name, {})['fingerprint'] = fingerprint
+            return trained
                 
         except Exception as e:
             logger.error(f"Model training/updating failed for {metric_name}: {str(e)}")
             return False
     
+    def _data_fingerprint(self, historical_data: List[Dict]) -> Tuple[int, Any, Any]:
+        """Cheap identity for a history: its length and the timestamps at both ends, whichever way it is ordered."""
+        return (len(historical_data), historical_data[0].get('metric_timestamp'), historical_data[-1].get('metric_timestamp'))
+    
     def _train_full_model(self, historical_data: List[Dict], metric_name: str):
         """Train a new model from scratch with all available data."""
         try:
@@ -258,13 +328,14 @@ class EnhancedMLAnalyzer:
                 'last_full_training': datetime.now().isoformat(),
                 'training_data_points': len(y),
                 'model_version': 1,
-                'performance_history': []
+                'performance_history': deque(maxlen=self.PERFORMANCE_HISTORY_SIZE)
             }
             
             # Prepare features and scaling
             scaler = StandardScaler()
             X_scaled = scaler.fit_transform(X)
             self.scalers[metric_name] = scaler
+            self._scaler_params[metric_name] = (float(scaler.mean_[0]), float(scaler.scale_[0]))
             
             # Try ARIMA first, fallback to continuous learning models
             model_trained = False
@@ -316,9 +387,11 @@ class EnhancedMLAnalyzer:
                 
                 logger.info(f"Trained SGD continuous learning model for {metric_name} (R²: {r2:.3f})")
             
-            # Cache training data for incremental updates
+            self._touch_model(metric_name)
+            
+            # Cache training data for incremental updates; timestamps are already in order
             self.last_training_data[metric_name] = {
-                'last_timestamp': max(entry['metric_timestamp'] for entry in historical_data),
+                'last_timestamp': timestamps[-1].isoformat(),
                 'data_points': len(historical_data),
                 'last_values': y[-5:].tolist() if len(y) >= 5 else y.tolist()
             }
@@ -350,13 +423,11 @@ class EnhancedMLAnalyzer:
             # Use the base_time from the original model for consistency
             base_time = model_info.get('base_time')
             if base_time:
-                X_new = np.array([(ts - base_time).days for ts in timestamps_new]).reshape(-1, 1)
+                X_new = self._days_since(timestamps_new, base_time)
             
             # Scale new features
-            scaler = self.scalers.get(metric_name)
-            if scaler:
-                X_new_scaled = scaler.transform(X_new)
-            else:
+            X_new_scaled = self._scale_features(metric_name, X_new)
+            if X_new_scaled is None:
                 logger.warning(f"No scaler found for {metric_name}, using unscaled data")
                 X_new_scaled = X_new
             
@@ -378,10 +449,13 @@ class EnhancedMLAnalyzer:
                 metadata['total_incremental_updates'] = metadata.get('total_incremental_updates', 0) + 1
                 metadata['training_data_points'] += len(y_new)
                 
-                # Track performance history
-                if 'performance_history' not in metadata:
-                    metadata['performance_history'] = []
+                # Track performance history; loaded models carry it as a list, so bound it on first update
+                if not isinstance(metadata.get('performance_history'), deque):
+                    metadata['performance_history'] = deque(
+                        metadata.get('performance_history', []), maxlen=self.PERFORMANCE_HISTORY_SIZE
+                    )
                 
+                # The deque drops the oldest record once it holds PERFORMANCE_HISTORY_SIZE
                 metadata['performance_history'].append({
                     'timestamp': datetime.now().isoformat(),
                     'new_data_points': len(y_new),
@@ -390,36 +464,65 @@ class EnhancedMLAnalyzer:
                     'update_type': 'incremental'
                 })
                 
-                # Keep only last 50 performance records
-                metadata['performance_history'] = metadata['performance_history'][-50:]
-                
                 logger.info(f"Incrementally updated model for {metric_name} with {len(y_new)} new points (R²: {r2_new:.3f})")
             
-            # Update cached training data
+            # Update cached training data; new points all follow the previous last timestamp
             self.last_training_data[metric_name] = {
-                'last_timestamp': max(entry['metric_timestamp'] for entry in all_data),
+                'last_timestamp': timestamps_new[-1].isoformat(),
                 'data_points': len(all_data),
                 'last_values': y_new[-5:].tolist() if len(y_new) >= 5 else y_new.tolist()
             }
             
-            # Save updated model
-            self._save_model(metric_name)
+            # Checkpoint every few updates; the saved model and its last_timestamp always match,
+            # so updates made since the last checkpoint are simply replayed after a restart
+            if self.model_metadata[metric_name].get('total_incremental_updates', 0) % self.SAVE_EVERY_N_UPDATES == 0:
+                self._save_model(metric_name)
+            else:
+                self._unsaved_updates.add(metric_name)
             
             return True
             
         except Exception as e:
             logger.error(f"Incremental model update failed for {metric_name}: {str(e)}")
-            # Fallback to full retraining if incremental update fails
-            return self._train_full_model(all_data, metric_name)
+            # Fallback to retraining on a recent window, so the cost doesn't grow with the whole history
+            return self._train_full_model(self._recent_window(all_data), metric_name)
+    
+    def _recent_window(self, historical_data: List[Dict]) -> List[Dict]:
+        """Entries within TRAIN_WINDOW_DAYS of the newest one, or all entries if that leaves too few to train on."""
+        seconds = []
+        for entry in historical_data:
+            timestamp = self._parse_timestamp(entry.get('metric_timestamp') or entry.get('date'))
+            seconds.append(timestamp.timestamp() if timestamp else None)
+            
+        known = [s for s in seconds if s is not None]
+        if not known:
+            return historical_data
+            
+        cutoff = max(known) - timedelta(days=self.TRAIN_WINDOW_DAYS).total_seconds()
+        windowed = [entry for entry, s in zip(historical_data, seconds) if s is not None and s >= cutoff]
+        return windowed if len(windowed) >= self.MIN_FORECAST_POINTS else historical_data
+            
+    def _scale_features(self, metric_name: str, X: np.ndarray) -> Optional[np.ndarray]:
+        """Standardize the day-offset column with the metric's fitted scaler, or None if it has none."""
+        params = self._scaler_params.get(metric_name)
+        if params is None:
+            scaler = self.scalers.get(metric_name)
+            if not scaler:
+                return None
+            # Models loaded from disk get their parameters cached on first use
+            params = self._scaler_params[metric_name] = (float(scaler.mean_[0]), float(scaler.scale_[0]))
+            
+        mean, scale = params
+        return (X - mean) / scale
             
     def predict_metric(self, metric_name: str, periods: int = 14) -> Optional[Dict]:
         """Generate forecast for specified metric with enhanced continuous learning support."""
-        if metric_name not in self.models:
+        model_info = self._get_model(metric_name)
+        if model_info is None:
             logger.warning(f"No trained model found for {metric_name}")
             return None
             
         try:
-            model_info = self.models[metric_name]
             model_type = model_info['type']
             model = model_info['model']
             
@@ -454,10 +557,8 @@ class EnhancedMLAnalyzer:
                 future_X = np.array([(date - base_time).days for date in future_dates]).reshape(-1, 1)
                 
                 # Scale features if scaler exists
-                scaler = self.scalers.get(metric_name)
-                if scaler:
-                    future_X_scaled = scaler.transform(future_X)
-                else:
+                future_X_scaled = self._scale_features(metric_name, future_X)
+                if future_X_scaled is None:
                     future_X_scaled = future_X
                 
                 predictions = model.predict(future_X_scaled)
@@ -465,7 +566,7 @@ class EnhancedMLAnalyzer:
                 # Enhanced confidence intervals based on model performance
                 if model_type == 'sgd_continuous':
                     # Use performance history to calculate dynamic confidence intervals
-                    performance_history = metadata.get('performance_history', [])
+                    performance_history = list(metadata.get('performance_history', []))
                     if performance_history:
                         recent_mse = np.mean([p.get('mse_on_new_data', 0) for p in performance_history[-5:]])
                         confidence_width = np.sqrt(recent_mse) * 1.96  # 95% confidence
@@ -502,11 +603,11 @@ class EnhancedMLAnalyzer:
     
     def get_model_learning_status(self, metric_name: str) -> Dict[str, Any]:
         """Get detailed status of model's continuous learning progress."""
-        if metric_name not in self.models:
+        model_info = self._get_model(metric_name)
+        if model_info is None:
             return {"error": "Model not found"}
         
         try:
-            model_info = self.models[metric_name]
             metadata = self.model_metadata.get(metric_name, {})
             
             status = {
@@ -520,7 +621,7 @@ class EnhancedMLAnalyzer:
             }
             
             # Performance trend analysis
-            performance_history = metadata.get('performance_history', [])
+            performance_history = list(metadata.get('performance_history', []))
             if performance_history:
                 recent_performance = performance_history[-5:]  # Last 5 updates
                 avg_recent_r2 = np.mean([p.get('r2_on_new_data', 0) for p in recent_performance])
@@ -553,6 +654,31 @@ class EnhancedMLAnalyzer:
             logger.error(f"Failed to get learning status for {metric_name}: {e}")
             return {"error": str(e)}
             
+    def _extract_nested_column(self, entries: List[Dict], metric_path: str) -> np.ndarray:
+        """Extract a dot-notation metric from every entry's metrics_data (or the entry itself) as float64, NaN where missing."""
+        keys = metric_path.split('.')
+        column = np.full(len(entries), np.nan)
+        
+        for i, entry in enumerate(entries):
+            value = entry.get('metrics_data', {})
+            for key in keys:
+                if not isinstance(value, dict) or key not in value:
+                    value = None
+                    break
+                value = value[key]
+                
+            # Fall back to direct field access when the nested value is missing or not numeric
+            for candidate in (value, entry.get(metric_path)):
+                if candidate is None:
+                    continue
+                try:
+                    column[i] = float(candidate)
+                    break
+                except (ValueError, TypeError):
+                    continue
+                    
+        return column
+        
     def _extract_nested_metric(self, metrics: Dict, metric_path: str) -> Optional[float]:
         """Extract nested metric value using dot notation (e.g., 'dora.lead_time.total_lead_time_hours')."""
         try:
@@ -583,43 +709,22 @@ class EnhancedMLAnalyzer:
             
         predictions = {}
         models_performance = {}
+        future_day = X[-1][0] + days_ahead
+        
+        candidates = [
+            ('linear', "Linear regression", LinearRegression()),
+            ('ridge', "Ridge regression", Ridge(alpha=1.0))
+        ]
         
-        # Linear Regression
-        try:
-            lr_model = LinearRegression()
-            lr_model.fit(X, y)
-            future_day = X[-1][0] + days_ahead
-            lr_pred = lr_model.predict([[future_day]])[0]
-            lr_score = r2_score(y, lr_model.predict(X))
-            predictions['linear'] = lr_pred
-            models_performance['linear'] = lr_score
-        except Exception as e:
-            logger.warning(f"Linear regression failed: {e}")
-            
-        # Ridge Regression
-        try:
-            ridge_model = Ridge(alpha=1.0)
-            ridge_model.fit(X, y)
-            future_day = X[-1][0] + days_ahead
-            ridge_pred = ridge_model.predict([[future_day]])[0]
-            ridge_score = r2_score(y, ridge_model.predict(X))
-            predictions['ridge'] = ridge_pred
-            models_performance['ridge'] = ridge_score
-        except Exception as e:
-            logger.warning(f"Ridge regression failed: {e}")
-            
         # Random Forest (for larger datasets)
         if len(X) >= 5:
-            try:
-                rf_model = RandomForestRegressor(n_estimators=50, random_state=42)
-                rf_model.fit(X, y)
-                future_day = X[-1][0] + days_ahead
-                rf_pred = rf_model.predict([[future_day]])[0]
-                rf_score = r2_score(y, rf_model.predict(X))
-                predictions['random_forest'] = rf_pred
-                models_performance['random_forest'] = rf_score
-            except Exception as e:
-                logger.warning(f"Random forest failed: {e}")
+            candidates.append(('random_forest', "Random forest", RandomForestRegressor(n_estimators=50, random_state=42)))
+            
+        results = [self._fit_and_forecast(label, model, X, y, future_day) for _, label, model in candidates]
+        
+        for (name, _, _), result in zip(candidates, results):
+            if result is not None:
+                predictions[name], models_performance[name] = result
                 
         if not predictions:
             return {
@@ -671,6 +776,15 @@ class EnhancedMLAnalyzer:
             "prediction_variance": round(pred_variance, 2)
         }
         
+    def _fit_and_forecast(self, label: str, model: Any, X: np.ndarray, y: np.ndarray, future_day: float) -> Optional[Tuple[float, float]]:
+        """Fit model and return (prediction at future_day, R² on the training data), or None if it fails."""
+        try:
+            model.fit(X, y)
+            return model.predict([[future_day]])[0], r2_score(y, model.predict(X))
+        except Exception as e:
+            logger.warning(f"{label} failed: {e}")
+            return None
+        
     def detect_anomalies(self, historical_data: List[Dict], metric_name: str) -> Dict[str, Any]:
         """Enhanced anomaly detection with multiple methods and error handling."""
         X, y, timestamps = self.prepare_time_series_data(historical_data, metric_name)
@@ -1236,7 +1350,6 @@ class EnhancedMLAnalyzer:
     def get_continuous_learning_status(self, historical_data: List[Dict] = None) -> Dict[str, Any]:
         """Get comprehensive continuous learning status for all models."""
         try:
-            total_models = len(self.models)
             continuously_learning_models = 0
             models_updated_recently = 0
             model_details = []
@@ -1256,8 +1369,8 @@ class EnhancedMLAnalyzer:
                     try:
                         # Try to train or update model
                         success = self.train_forecasting_model(historical_data, metric_name)
-                        if success and metric_name in self.models:
-                            model_info = self.models[metric_name]
+                        model_info = self._get_model(metric_name) if success else None
+                        if model_info:
                             metadata = self.model_metadata.get(metric_name, {})
                             
                             supports_learning = model_info.get('supports_incremental', False)
@@ -1279,12 +1392,15 @@ class EnhancedMLAnalyzer:
                                 "type": model_info['type'],
                                 "supports_learning": supports_learning,
                                 "training_points": metadata.get('training_data_points', 0),
-                                "performance": metadata.get('performance_history', [])[-1:] if metadata.get('performance_history') else []
+                                "performance": list(metadata.get('performance_history', []))[-1:]
                             })
                     except Exception as e:
                         logger.debug(f"Failed to process model for {metric_name}: {e}")
                         continue
             
+            # Models load lazily and only MAX_IN_MEMORY_MODELS stay resident, so count saved ones too
+            total_models = len(self._saved_model_names() | set(self.models))
+            
             # Calculate learning percentage
             learning_percentage = round((continuously_learning_models / max(total_models, 1)) * 100) if total_models > 0 else 0
             
@@ -2,11 +2,11 @@
 Enhanced GitHub API with multiple repository fetching methods
 """
 import requests
-import time
 import logging
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
-from backend.github_api import GitHubAPI
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from backend.github_api import GitHubAPI, _loads, _months_ago_iso
 
 logger = logging.getLogger(__name__)
 
@@ -22,45 +22,6 @@ class EnhancedGitHubAPI(GitHubAPI):
         self.graphql_url = "https://api.github.com/graphql"  # For compatibility
         logger.info("🚀 Enhanced GitHub API initialized with comprehensive repository discovery")
     
-    def execute_query(self, query: str, variables: Optional[dict] = None, retries: int = 3, backoff_factor: int = 2) -> Optional[dict]:
-        """Executes a GraphQL query with enhanced retry logic and rate limit handling."""
-        attempt = 0
-        while attempt < retries:
-            try:
-                response = requests.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables or {}},
-                    headers=self.headers
-                )
-                
-                # Handle rate limiting
-                if response.status_code == 429 or (response.status_code == 403 and "rate limit" in response.text.lower()):
-                    reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                    sleep_time = max(reset_time - int(time.time()), 60)
-                    logger.warning(f"Rate limited. Sleeping for {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                    continue
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if "errors" in data:
-                    error_messages = [e.get("message", "Unknown error") for e in data["errors"]]
-                    logger.error(f"GraphQL errors: {', '.join(error_messages)}")
-                    raise ValueError(f"GraphQL errors: {', '.join(error_messages)}")
-                
-                return data
-                
-            except (requests.exceptions.RequestException, ValueError) as e:
-                attempt += 1
-                wait_time = backoff_factor ** attempt
-                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait_time}s...")
-                if attempt < retries:
-                    time.sleep(wait_time)
-        
-        logger.error("All retries failed.")
-        return None
-    
     def discover_all_accessible_repositories(self, include_private: bool = True) -> List[Dict[str, Any]]:
         """Discover ALL accessible repositories using multiple methods."""
         logger.info("🔍 Starting comprehensive repository discovery...")
@@ -130,9 +91,9 @@ class EnhancedGitHubAPI(GitHubAPI):
         
         try:
             # Get user's organizations
-            org_response = requests.get(f"{self.rest_url}/user/orgs", headers=self.headers)
+            org_response = self.session.get(f"{self.rest_url}/user/orgs")
             org_response.raise_for_status()
-            organizations = org_response.json()
+            organizations = _loads(org_response.content)
             
             logger.info(f"🏢 Found {len(organizations)} organizations")
             
@@ -149,9 +110,9 @@ class EnhancedGitHubAPI(GitHubAPI):
                     while page <= 10:  # Limit pages per org
                         params["page"] = page
                         
-                        repo_response = requests.get(org_repos_url, headers=self.headers, params=params)
+                        repo_response = self.session.get(org_repos_url, params=params)
                         repo_response.raise_for_status()
-                        org_repos = repo_response.json()
+                        org_repos = _loads(repo_response.content)
                         
                         if not org_repos:
                             break
@@ -277,9 +238,9 @@ class EnhancedGitHubAPI(GitHubAPI):
             }
             
             try:
-                response = requests.get(url, headers=self.headers, params=params)
+                response = self.session.get(url, params=params)
                 response.raise_for_status()
-                repos = response.json()
+                repos = _loads(response.content)
                 
                 if not repos:
                     break
@@ -318,9 +279,9 @@ class EnhancedGitHubAPI(GitHubAPI):
         """Search for user's repositories using Search API."""
         # Get current user first
         try:
-            user_response = requests.get(f"{self.rest_url}/user", headers=self.headers)
+            user_response = self.session.get(f"{self.rest_url}/user")
             user_response.raise_for_status()
-            username = user_response.json().get("login")
+            username = _loads(user_response.content).get("login")
             
             if not username:
                 return []
@@ -342,9 +303,9 @@ class EnhancedGitHubAPI(GitHubAPI):
                 }
                 
                 try:
-                    response = requests.get(url, headers=self.headers, params=params)
+                    response = self.session.get(url, params=params)
                     response.raise_for_status()
-                    data = response.json()
+                    data = _loads(response.content)
                     
                     for repo in data.get("items", []):
                         # Skip if private and not requested
@@ -377,12 +338,13 @@ class EnhancedGitHubAPI(GitHubAPI):
             logger.warning(f"Search repositories failed: {e}")
             return []
 
-    def fetch_global_user_activity(self, user_email: str, months_back: int = 6) -> Dict[str, Any]:
+    def fetch_global_user_activity(self, user_email: str, months_back: int = 6, columnar: bool = False,
+                                   spool: bool = False) -> Dict[str, Any]:
         """Fetch global user activity across all accessible repositories using enhanced discovery"""
         try:
             # Calculate date range
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=months_back * 30)
+            start_date = end_date - relativedelta(months=months_back)
             
             # First, get user info to extract username
             user_info = self.get_authenticated_user()
@@ -405,40 +367,12 @@ class EnhancedGitHubAPI(GitHubAPI):
             
             logger.info(f"🎯 Analyzing activity across {len(repositories)} repositories")
             
-            all_commits = []
-            all_prs = []
-            
-            # Fetch data from each repository (NO TIME LIMIT by default)
-            for repo in repositories:
-                try:
-                    owner = repo.get("owner", {}).get("login", "")
-                    name = repo.get("name", "")
-                    
-                    if not owner or not name:
-                        continue
-                    
-                    # Fetch ALL-TIME commits and PRs (unless months_back specifically requested)
-                    days_back_param = months_back * 30 if months_back < 12 else None  # Only limit if < 1 year
-                    
-                    # Fetch commits for this repo
-                    repo_commits = self.fetch_commits(owner, name, developer_email=user_email, days_back=days_back_param)
-                    if repo_commits:
-                        # Add repository info to each commit
-                        for commit in repo_commits:
-                            commit["repository"] = f"{owner}/{name}"
-                        all_commits.extend(repo_commits)
-                    
-                    # Fetch PRs for this repo
-                    repo_prs = self.fetch_pull_requests(owner, name, developer_email=user_email, days_back=days_back_param)
-                    if repo_prs:
-                        # Add repository info to each PR
-                        for pr in repo_prs:
-                            pr["repository"] = f"{owner}/{name}"
-                        all_prs.extend(repo_prs)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to fetch data for {owner}/{name}: {str(e)}")
-                    continue
+            # Fetch ALL-TIME commits and PRs (unless months_back specifically requested)
+            since = _months_ago_iso(months_back) if months_back < 12 else None  # Only limit if < 1 year
+            ordered_repositories = self._order_by_commit_search(repositories, username, since)
+            all_commits, all_prs = self._collect_repo_activity(ordered_repositories, user_email, since, spool)
+            if columnar:
+                all_commits, all_prs = self._columnar_activity(all_commits, all_prs)
             
             logger.info(f"🎉 Global activity: {len(all_commits)} commits + {len(all_prs)} PRs across {len(repositories)} repos")
             
@@ -460,9 +394,9 @@ class EnhancedGitHubAPI(GitHubAPI):
         """Get authenticated user information"""
         try:
             url = f"{self.rest_url}/user"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return _loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error fetching user info: {str(e)}")
             return None
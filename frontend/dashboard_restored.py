@@ -500,14 +500,16 @@ def display_global_metrics(user_email: str, user_id: str):
         ml = get_ml_analyzer()
         summary_bot = get_summary_bot()
         
-        # Get current and historical metrics
-        current_metrics = db.get_user_metrics(user_id, limit=1)
+        # Get current and historical metrics concurrently
+        current_metrics, historical_data = db.gather(
+            db.aget_user_metrics(user_id, limit=1),
+            db.aget_user_metrics(user_id, limit=20)
+        )
         if not current_metrics:
             st.warning("No metrics data available. Click 'Refresh Metrics Now' to load data.")
             return
         
         metrics = current_metrics[0]['metrics_data']
-        historical_data = db.get_user_metrics(user_id, limit=20)
         
         # Generate AI insights
         insights = summary_bot.generate_comprehensive_summary(